@@ -22,7 +22,7 @@ bl_info = {
     "author": "FakeSeven",
     "version": (1, 7, 3),
     "location": "3D View > WTtool Panel",
-    "warning": ""
+    "warning": "",
     "license": "GPL-3.0-or-later",
 }
 
@@ -30,9 +30,159 @@ import bpy
 import bmesh
 import os
 import json 
+import functools
+import gzip
+import hashlib
 import math
-from bpy.props import BoolProperty, StringProperty, CollectionProperty, IntProperty, FloatProperty
+import mmap
+import re
+import shutil
+import struct
+import sys
+import tempfile
+import time
+import numpy as np
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+from bpy.props import BoolProperty, StringProperty, CollectionProperty, IntProperty, FloatProperty, EnumProperty
 from bpy.types import Operator, Panel, PropertyGroup, UIList
+from bpy_extras.io_utils import ImportHelper, ExportHelper
+from mathutils import Matrix
+
+PROFILE_HISTORY_SIZE = 20
+
+_profile_history = deque(maxlen=PROFILE_HISTORY_SIZE)
+_profile_stack = []
+
+def profile_count(key, n=1):
+    if _profile_stack:
+        counters = _profile_stack[-1]["counters"]
+        counters[key] = counters.get(key, 0) + n
+
+def profile_record(key, entry):
+    # Per-item details (one entry per object...) that are too many for the panel; they end up in
+    # the exported JSON under "records".
+    if _profile_stack:
+        _profile_stack[-1]["records"].setdefault(key, []).append(entry)
+
+def start_profile_run(operator):
+    parent = _profile_stack[-1] if _profile_stack else None
+    run = {
+        "operator": operator,
+        "started": time.strftime("%H:%M:%S"),
+        "result": ["ERROR"],
+        "seconds": 0.0,
+        "counters": {},
+        "records": {},
+        "children": [],
+    }
+    if parent is None:
+        before = ({coll.as_pointer() for coll in bpy.data.collections}, len(bpy.data.objects))
+    else:
+        parent["counters"]["ops_calls"] = parent["counters"].get("ops_calls", 0) + 1
+        before = None
+    return run, parent, before, time.perf_counter()
+
+def finish_profile_run(run, parent, before, start):
+    run["seconds"] = round(time.perf_counter() - start, 4)
+
+    if parent is not None:
+        for key, n in run["counters"].items():
+            parent["counters"][key] = parent["counters"].get(key, 0) + n
+        for key, entries in run["records"].items():
+            parent["records"].setdefault(key, []).extend(entries)
+        parent["children"].append({"operator": run["operator"], "result": run["result"], "seconds": run["seconds"]})
+    else:
+        collections_before, objects_before = before
+        collections_after = {coll.as_pointer() for coll in bpy.data.collections}
+        objects_after = len(bpy.data.objects)
+        run["collections_created"] = len(collections_after - collections_before)
+        run["collections_removed"] = len(collections_before - collections_after)
+        run["objects_created"] = max(0, objects_after - objects_before)
+        run["objects_removed"] = max(0, objects_before - objects_after)
+        _profile_history.append(run)
+
+def profile_operator_execute(cls):
+    execute = getattr(cls, "execute", None)
+    if execute is None or hasattr(execute, "__wrapped__"):
+        return
+
+    @functools.wraps(execute)
+    def profiled_execute(self, context):
+        profile = start_profile_run(cls.bl_idname)
+        run = profile[0]
+        _profile_stack.append(run)
+        try:
+            result = execute(self, context)
+            run["result"] = sorted(result)
+            return result
+        finally:
+            _profile_stack.pop()
+            finish_profile_run(*profile)
+
+    cls.execute = profiled_execute
+
+def unprofile_operator_execute(cls):
+    execute = cls.__dict__.get("execute")
+    if execute is not None and hasattr(execute, "__wrapped__"):
+        cls.execute = execute.__wrapped__
+
+def draw_profile_section(layout, scene):
+    box = layout.box()
+    row = box.row()
+    row.prop(scene, "wtt_show_profile", icon='TRIA_DOWN' if scene.wtt_show_profile else 'TRIA_RIGHT', emboss=False)
+    if not scene.wtt_show_profile:
+        return
+
+    row = box.row(align=True)
+    row.operator("wtt.export_profile", text="Export JSON", icon='EXPORT')
+    row.operator("wtt.clear_profile", text="Clear", icon='TRASH')
+
+    if not _profile_history:
+        box.label(text="No operations recorded yet.")
+        return
+
+    col = box.column(align=True)
+    for run in reversed(_profile_history):
+        col.label(text=f"{run['started']}  {run['operator']}  {run['seconds'] * 1000:.1f} ms  {'/'.join(run['result'])}")
+        details = [f"{key}: {n}" for key, n in sorted(run["counters"].items())]
+        for key in ("collections_created", "collections_removed", "objects_created", "objects_removed"):
+            if run.get(key):
+                details.append(f"{key}: {run[key]}")
+        details.extend(f"{key}: {len(entries)} records" for key, entries in sorted(run["records"].items()))
+        if details:
+            col.label(text="    " + ", ".join(details))
+        for child in run["children"]:
+            col.label(text=f"    > {child['operator']}  {child['seconds'] * 1000:.1f} ms")
+
+class WTT_OT_ExportProfile(Operator, ExportHelper):
+    bl_idname = "wtt.export_profile"
+    bl_label = "Export Profile"
+    bl_description = "Export the recorded operator timings and counters as .json"
+
+    filename_ext = ".json"
+    filter_glob: StringProperty(default="*.json", options={'HIDDEN'})
+
+    def execute(self, context):
+        report = {
+            "addon_version": list(bl_info["version"]),
+            "blender_version": bpy.app.version_string,
+            "runs": list(_profile_history),
+        }
+        with open(self.filepath, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        self.report({'INFO'}, f"Exported {len(_profile_history)} runs to '{os.path.basename(self.filepath)}'.")
+        return {'FINISHED'}
+
+class WTT_OT_ClearProfile(Operator):
+    bl_idname = "wtt.clear_profile"
+    bl_label = "Clear Profile"
+    bl_description = "Clear the recorded operator timings"
+
+    def execute(self, context):
+        _profile_history.clear()
+        return {'FINISHED'}
 
 def cleanup_scene_props(scene):
     scene.wtt_keep_groups.clear()
@@ -44,71 +194,719 @@ def cleanup_material_list(scene):
     scene.wtt_material_list.clear()
     scene.wtt_material_list_index = 0
 
-def get_all_ground_objects(context, include_hidden=False):
-    work_collection = bpy.data.collections.get("Ground_Work")
+HIDDEN_COLLECTION_NAMES = {"Ground_Work": "Hidden_Items", "Aviation_Work": "Hidden_Air_Items"}
+NAME_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+_scene_indexes = {}
+
+def invalidate_scene_index():
+    _scene_indexes.clear()
+
+def run_steps(steps):
+    # Drives a step generator (see TimeSlicedOperator) to the end and returns its result.
+    while True:
+        try:
+            next(steps)
+        except StopIteration as e:
+            return e.value
+
+def scale_progress(steps, start, end):
+    while True:
+        try:
+            fraction = next(steps)
+        except StopIteration as e:
+            return e.value
+        yield start + (end - start) * fraction
+
+def iter_build_scene_index(work_collection_name):
+    index = {
+        "objects": [],
+        "hidden_objects": [],
+        "groups": {},
+        "group_objects": {},
+        "images": {},
+        "texture_keys": {},
+        "key_objects": {},
+        "name_tokens": {},
+    }
+    work_collection = bpy.data.collections.get(work_collection_name)
     if not work_collection:
-        return []
-    
-    objects_to_process = list(work_collection.objects)
-    
-    collections_to_check = list(work_collection.children)
-    
+        return index
+
+    sources = [(work_collection, None)] + [(coll, coll) for coll in work_collection.children]
+    total = max(1, sum(len(coll.objects) for coll, group in sources))
+    done = 0
+    for coll, group in sources:
+        for obj in coll.objects:
+            done += 1
+            yield done / total
+            obj_ptr = obj.as_pointer()
+            if obj.type != 'MESH' or obj_ptr in index["groups"]:
+                continue
+            image_datablock = get_base_color_texture_from_obj(obj)
+            filename_key = get_texture_filename_key(image_datablock)
+
+            index["objects"].append(obj)
+            index["groups"][obj_ptr] = group
+            if group:
+                index["group_objects"].setdefault(group.name, []).append(obj)
+            index["images"][obj_ptr] = image_datablock
+            index["texture_keys"][obj_ptr] = filename_key
+            index["key_objects"].setdefault(filename_key, []).append(obj)
+            for token in set(NAME_TOKEN_PATTERN.findall(obj.name.lower())):
+                index["name_tokens"].setdefault(token, []).append(obj)
+
+    hidden_coll = bpy.data.collections.get(HIDDEN_COLLECTION_NAMES.get(work_collection_name, ""))
+    if hidden_coll and hidden_coll.name not in work_collection.children:
+        index["hidden_objects"] = [obj for obj in hidden_coll.objects if obj.type == 'MESH']
+    return index
+
+def build_scene_index(work_collection_name):
+    return run_steps(iter_build_scene_index(work_collection_name))
+
+def iter_scene_index(work_collection_name):
+    index = _scene_indexes.get(work_collection_name)
+    if index is None:
+        index = yield from iter_build_scene_index(work_collection_name)
+        _scene_indexes[work_collection_name] = index
+    return index
+
+def get_scene_index(work_collection_name):
+    return run_steps(iter_scene_index(work_collection_name))
+
+def get_ungrouped_entries(index):
+    return [
+        (obj, obj.name.lower(), index["texture_keys"][obj.as_pointer()])
+        for obj in index["objects"] if index["groups"][obj.as_pointer()] is None
+    ]
+
+def find_indexed_objects_by_name(index, substrings):
+    found = {}
+    for token, obj_list in index["name_tokens"].items():
+        if any(sub in token for sub in substrings):
+            for obj in obj_list:
+                found[obj.as_pointer()] = obj
+    return list(found.values())
+
+@bpy.app.handlers.persistent
+def on_depsgraph_update_post(scene, depsgraph):
+    # Node tree edits and image changes can move the Base Color texture of any material, so the
+    # texture caches are dropped as a whole; a plain material update only drops that material.
+    if _material_texture_cache or _image_key_cache:
+        if depsgraph.id_type_updated('IMAGE') or depsgraph.id_type_updated('NODETREE'):
+            invalidate_texture_cache()
+        elif depsgraph.id_type_updated('MATERIAL'):
+            for update in depsgraph.updates:
+                if isinstance(update.id, bpy.types.Material):
+                    invalidate_texture_cache(update.id.original)
+    if _scene_indexes and any(depsgraph.id_type_updated(id_type) for id_type in ('OBJECT', 'COLLECTION', 'MATERIAL', 'IMAGE')):
+        invalidate_scene_index()
+
+@bpy.app.handlers.persistent
+def on_load_post(*args):
+    _material_fingerprints.clear()
+    invalidate_texture_cache()
+
+@bpy.app.handlers.persistent
+def on_undo_redo_post(*args):
+    # Undo and redo reload the datablocks, so cached pointers may point at freed or reused memory.
+    _material_fingerprints.clear()
+    invalidate_texture_cache()
+
+def get_all_ground_objects(context, include_hidden=False):
+    index = get_scene_index("Ground_Work")
     if include_hidden:
-        hidden_coll = bpy.data.collections.get("Hidden_Items")
-        if hidden_coll:
-            if hidden_coll.name not in work_collection.children:
-                objects_to_process.extend(list(hidden_coll.objects))
+        return index["objects"] + index["hidden_objects"]
+    return list(index["objects"])
 
-    for coll in collections_to_check:
-        objects_to_process.extend(list(coll.objects))
-    
-    return [obj for obj in objects_to_process if obj.type == 'MESH']
+_material_texture_cache = {}
+_image_key_cache = {}
+
+def get_group_collection(group_name, new_collections):
+    coll = bpy.data.collections.get(group_name)
+    if not coll:
+        coll = bpy.data.collections.new(group_name)
+        new_collections.append(coll)
+    return coll
+
+def iter_relink_objects(moves, source_collections, parent_collection=None, new_collections=(), remove_collections=()):
+    # moves is a list of (object, target collection) pairs. Each object leaves every source
+    # collection it is linked to and joins its target. New collections are filled while they are
+    # still outside the scene and only then linked under parent_collection, so the view layer is
+    # resynced once instead of once per object.
+    coll_by_ptr = {coll.as_pointer(): coll for coll in source_collections}
+    membership = {}
+    for coll_ptr, coll in coll_by_ptr.items():
+        for obj in coll.objects:
+            membership.setdefault(obj.as_pointer(), []).append(coll_ptr)
+
+    target_members = {}
+    moved = 0
+    total = max(1, len(moves))
+    for obj, target in moves:
+        obj_ptr = obj.as_pointer()
+        target_ptr = target.as_pointer()
+        linked = target_members.get(target_ptr)
+        if linked is None:
+            linked = target_members[target_ptr] = {o.as_pointer() for o in target.objects}
+        if obj_ptr not in linked:
+            target.objects.link(obj)
+            linked.add(obj_ptr)
+        for coll_ptr in membership.pop(obj_ptr, ()):
+            if coll_ptr != target_ptr:
+                coll_by_ptr[coll_ptr].objects.unlink(obj)
+        moved += 1
+        yield moved / total
+
+    for coll in new_collections:
+        parent_collection.children.link(coll)
+    if remove_collections:
+        bpy.data.batch_remove(list(remove_collections))
+    bpy.context.view_layer.update()
+    invalidate_scene_index()
+
+    profile_count("objects_relinked", moved)
+    return moved
+
+def relink_objects(moves, source_collections, parent_collection=None, new_collections=(), remove_collections=()):
+    return run_steps(iter_relink_objects(moves, source_collections, parent_collection, new_collections, remove_collections))
+
+def undo_relink(moves, sources, new_collections=()):
+    # Puts the objects an interrupted iter_relink_objects already moved back into their sources
+    # and removes the collections it created.
+    targets = {target.as_pointer(): target for obj, target in moves}
+    linked = {ptr: {obj.as_pointer() for obj in target.objects} for ptr, target in targets.items()}
+    back_moves = [
+        (obj, source) for (obj, target), source in zip(moves, sources)
+        if obj.as_pointer() in linked[target.as_pointer()]
+    ]
+    relink_objects(back_moves, list(targets.values()), remove_collections=new_collections)
+
+MODAL_SLICE_SECONDS = 0.05
+MODAL_PASS_THROUGH_EVENTS = {
+    'MOUSEMOVE', 'INBETWEEN_MOUSEMOVE', 'MIDDLEMOUSE', 'WHEELUPMOUSE', 'WHEELDOWNMOUSE',
+    'TRACKPADPAN', 'TRACKPADZOOM', 'NDOF_MOTION',
+}
+
+class TimeSlicedOperator:
+    # Subclasses implement run_steps(context) as a generator that yields its progress (0-1) and
+    # returns the result set, plus rollback(context). Scripts (EXEC_DEFAULT) run the steps to the
+    # end; from the UI they run from a timer in MODAL_SLICE_SECONDS slices and Esc rolls back.
+    def execute(self, context):
+        return run_steps(self.run_steps(context))
+
+    def invoke(self, context, event):
+        # The modal run is profiled as one operator run: its counters are collected while a slice
+        # runs and it is recorded when the steps finish or are cancelled.
+        self._steps = self.run_steps(context)
+        self._started = False
+        self._profile = start_profile_run(self.bl_idname)
+        wm = context.window_manager
+        wm.progress_begin(0.0, 1.0)
+        self._timer = wm.event_timer_add(0.01, window=context.window)
+        wm.modal_handler_add(self)
+        return {'RUNNING_MODAL'}
+
+    def end_modal(self, context, result=None):
+        wm = context.window_manager
+        wm.event_timer_remove(self._timer)
+        wm.progress_end()
+        if result is not None:
+            self._profile[0]["result"] = sorted(result)
+        finish_profile_run(*self._profile)
+        return result
+
+    def modal(self, context, event):
+        if event.type == 'ESC':
+            _profile_stack.append(self._profile[0])
+            try:
+                self._steps.close()
+                if self._started:
+                    self.rollback(context)
+            finally:
+                _profile_stack.pop()
+            self.report({'WARNING'}, f"{self.bl_label} cancelled, changes rolled back.")
+            return self.end_modal(context, {'CANCELLED'})
+        if event.type != 'TIMER':
+            return {'PASS_THROUGH'} if event.type in MODAL_PASS_THROUGH_EVENTS else {'RUNNING_MODAL'}
+
+        progress = 0.0
+        deadline = time.perf_counter() + MODAL_SLICE_SECONDS
+        _profile_stack.append(self._profile[0])
+        try:
+            self._started = True
+            while time.perf_counter() < deadline:
+                progress = next(self._steps)
+        except StopIteration as e:
+            return self.end_modal(context, e.value)
+        except Exception:
+            self.end_modal(context)
+            raise
+        finally:
+            _profile_stack.pop()
+
+        context.window_manager.progress_update(progress)
+        return {'RUNNING_MODAL'}
+
+def estimate_mesh_bytes(mesh):
+    return (
+        len(mesh.vertices) * 12
+        + len(mesh.edges) * 8
+        + len(mesh.loops) * (8 + 8 * len(mesh.uv_layers))
+        + len(mesh.polygons) * 12
+    )
+
+def estimate_image_bytes(image):
+    if not image.has_data:
+        return 0
+    width, height = image.size
+    return width * height * image.channels * (4 if image.is_float else 1)
+
+def delete_objects_and_orphans(objects, collections=()):
+    # Objects, the meshes only they use and the collections go in one batch; the materials and
+    # images that became unused are removed in two more batches. Returns (objects, bytes freed).
+    objects = list({obj.as_pointer(): obj for obj in objects}.values())
+    mesh_refs = {}
+    for obj in objects:
+        if obj.type == 'MESH' and obj.data:
+            mesh_ref = mesh_refs.setdefault(obj.data.as_pointer(), [obj.data, 0])
+            mesh_ref[1] += 1
+    meshes = [mesh for mesh, count in mesh_refs.values() if mesh.users == count]
+
+    material_candidates = {}
+    for mesh in meshes:
+        for mat in mesh.materials:
+            if mat:
+                material_candidates[mat.as_pointer()] = mat
+    for obj in objects:
+        for slot in obj.material_slots:
+            if slot.link == 'OBJECT' and slot.material:
+                material_candidates[slot.material.as_pointer()] = slot.material
+
+    freed_bytes = sum(estimate_mesh_bytes(mesh) for mesh in meshes)
+    bpy.data.batch_remove(objects + meshes + list(collections))
+    invalidate_scene_index()
+
+    materials = [mat for mat in material_candidates.values() if mat.users == 0]
+    image_candidates = {}
+    for mat in materials:
+        if mat.node_tree:
+            for node in mat.node_tree.nodes:
+                if node.type == 'TEX_IMAGE' and node.image:
+                    image_candidates[node.image.as_pointer()] = node.image
+    if materials:
+        invalidate_texture_cache()
+        forget_material_fingerprints(materials)
+        bpy.data.batch_remove(materials)
+
+    images = [image for image in image_candidates.values() if image.users == 0]
+    if images:
+        freed_bytes += sum(estimate_image_bytes(image) for image in images)
+        bpy.data.batch_remove(images)
+
+    profile_count("datablocks_removed", len(objects) + len(meshes) + len(collections) + len(materials) + len(images))
+    return len(objects), freed_bytes
+
+def invalidate_texture_cache(material=None):
+    if material is None:
+        _material_texture_cache.clear()
+        _image_key_cache.clear()
+        invalidate_scene_index()
+    else:
+        _material_texture_cache.pop(material.as_pointer(), None)
+
+MATERIAL_TEMPLATE_NAME = ".WTT_Material_Template"
+
+_material_fingerprints = {}
+
+def get_material_template():
+    # Output <- Principled BSDF <- Image Texture, built once and copied for every new group material.
+    template = bpy.data.materials.get(MATERIAL_TEMPLATE_NAME)
+    if template is None:
+        template = bpy.data.materials.new(MATERIAL_TEMPLATE_NAME)
+        template.use_fake_user = True
+        template.use_nodes = True
+        nodes = template.node_tree.nodes
+        nodes.clear()
+        output = nodes.new('ShaderNodeOutputMaterial')
+        output.location = (300, 0)
+        bsdf = nodes.new('ShaderNodeBsdfPrincipled')
+        tex_node = nodes.new('ShaderNodeTexImage')
+        tex_node.location = (-400, 0)
+        template.node_tree.links.new(bsdf.outputs['BSDF'], output.inputs['Surface'])
+        template.node_tree.links.new(tex_node.outputs['Color'], bsdf.inputs['Base Color'])
+    return template
+
+def get_material_fingerprint(mat, image):
+    # Link endpoints and texture node images are part of the key, so a relinked socket or an image
+    # swapped on an existing node is seen even when the node and link counts stay the same.
+    node_tree = mat.node_tree
+    links = sorted(
+        (link.from_node.name, link.from_socket.identifier, link.to_node.name, link.to_socket.identifier)
+        for link in node_tree.links
+    )
+    tex_images = sorted(
+        (node.name, node.image.as_pointer(), node.image.filepath) if node.image else (node.name, 0, "")
+        for node in node_tree.nodes if node.type == 'TEX_IMAGE'
+    )
+    return (
+        mat.name,
+        node_tree.as_pointer(),
+        len(node_tree.nodes),
+        tuple(links),
+        tuple(tex_images),
+        image.as_pointer() if image else 0,
+        image.filepath if image else "",
+    )
+
+def forget_material_fingerprints(materials):
+    # Called before materials are freed, so a new material reusing the address starts unchecked.
+    for mat in materials:
+        _material_fingerprints.pop(mat.as_pointer(), None)
+
+def link_base_color_texture(mat, bsdf, image):
+    node_tree = mat.node_tree
+    tex_node = next((node for node in node_tree.nodes if node.type == 'TEX_IMAGE' and node.image == image), None)
+    if not tex_node:
+        tex_node = node_tree.nodes.new('ShaderNodeTexImage')
+        tex_node.image = image
+    base_color = bsdf.inputs['Base Color']
+    if not any(link.from_node == tex_node for link in base_color.links):
+        node_tree.links.new(tex_node.outputs['Color'], base_color)
+
+def ensure_group_material(name, image):
+    # Materials already checked against this image are skipped through their fingerprint; new or
+    # node-less materials are copied from the template, and existing ones only get their Base
+    # Color texture fixed.
+    mat = bpy.data.materials.get(name)
+    if mat and mat.use_nodes and mat.node_tree:
+        fingerprint = get_material_fingerprint(mat, image)
+        if _material_fingerprints.get(mat.as_pointer()) == fingerprint:
+            return mat
+
+        bsdf = next((node for node in mat.node_tree.nodes if node.type == 'BSDF_PRINCIPLED'), None)
+        if bsdf:
+            if image:
+                link_base_color_texture(mat, bsdf, image)
+            invalidate_texture_cache(mat)
+            _material_fingerprints[mat.as_pointer()] = get_material_fingerprint(mat, image)
+            return mat
+
+    new_mat = get_material_template().copy()
+    new_mat.use_fake_user = False
+    for node in list(new_mat.node_tree.nodes):
+        if node.type == 'TEX_IMAGE':
+            if image:
+                node.image = image
+            else:
+                # An empty texture node on Base Color renders black; without an image the
+                # material keeps the BSDF's default base color instead.
+                new_mat.node_tree.nodes.remove(node)
+    if mat:
+        mat.user_remap(new_mat)
+        forget_material_fingerprints([mat])
+        bpy.data.materials.remove(mat)
+    new_mat.name = name
+    profile_count("materials_created")
+    _material_fingerprints[new_mat.as_pointer()] = get_material_fingerprint(new_mat, image)
+    return new_mat
+
+def assign_single_material(objects, material, displaced):
+    # Leaves every mesh with exactly one slot holding material. Meshes that already have it are
+    # skipped, and the materials taken out of slots are collected in displaced (pointer -> material)
+    # so the caller only has to check those for orphans. Returns (meshes changed, meshes skipped).
+    assigned = 0
+    skipped = 0
+    seen = set()
+    for obj in objects:
+        if obj.type != 'MESH':
+            continue
+        mesh = obj.data
+        mesh_ptr = mesh.as_pointer()
+        if mesh_ptr in seen:
+            continue
+        seen.add(mesh_ptr)
+
+        slots = mesh.materials
+        if len(slots) == 1 and slots[0] == material:
+            skipped += 1
+            continue
+
+        for mat in slots:
+            if mat and mat != material:
+                displaced[mat.as_pointer()] = mat
+        if not slots:
+            slots.append(material)
+        else:
+            slot_count = len(slots)
+            slots[0] = material
+            for _ in range(slot_count - 1):
+                slots.pop()
+            if slot_count > 1 and mesh.polygons:
+                mesh.polygons.foreach_set("material_index", np.zeros(len(mesh.polygons), dtype=np.int32))
+        assigned += 1
+    return assigned, skipped
+
+def get_base_color_texture_from_material(mat):
+    cache_key = mat.as_pointer()
+    if cache_key in _material_texture_cache:
+        return _material_texture_cache[cache_key]
+
+    image_datablock = None
+    if mat.use_nodes and mat.node_tree:
+        principled_bsdf = None
+        for n in mat.node_tree.nodes:
+            if n.type == 'BSDF_PRINCIPLED':
+                principled_bsdf = n
+                break
+        
+        if principled_bsdf:
+            base_color_input = principled_bsdf.inputs.get('Base Color')
+            if base_color_input and base_color_input.is_linked:
+                from_node = base_color_input.links[0].from_node
+                if from_node and from_node.type == 'TEX_IMAGE' and from_node.image:
+                    image_datablock = from_node.image
+
+        if not image_datablock:
+            for node in mat.node_tree.nodes:
+                if node.type == 'TEX_IMAGE' and node.image:
+                    image_datablock = node.image 
+                    break
+
+    _material_texture_cache[cache_key] = image_datablock
+    return image_datablock
 
 def get_base_color_texture_from_obj(obj):
     if obj.type != 'MESH' or not obj.data.materials:
         return None
 
-    image_datablock = None
-    found_linked_color = False
-    
     for mat_slot in obj.material_slots:
         mat = mat_slot.material
-        if mat and mat.use_nodes and mat.node_tree:
-            
-            principled_bsdf = None
-            for n in mat.node_tree.nodes:
-                if n.type == 'BSDF_PRINCIPLED':
-                    principled_bsdf = n
-                    break
-            
-            if principled_bsdf:
-                base_color_input = principled_bsdf.inputs.get('Base Color')
-                if base_color_input and base_color_input.is_linked:
-                    from_node = base_color_input.links[0].from_node
-                    if from_node and from_node.type == 'TEX_IMAGE' and from_node.image:
-                        image_datablock = from_node.image
-                        found_linked_color = True
-                        break 
-
-            if not found_linked_color:
-                for node in mat.node_tree.nodes:
-                    if node.type == 'TEX_IMAGE' and node.image:
-                        image_datablock = node.image 
-                        break
-        
-        if image_datablock:
-            break 
+        if mat:
+            image_datablock = get_base_color_texture_from_material(mat)
+            if image_datablock:
+                return image_datablock
     
-    return image_datablock
+    return None
 
 def get_texture_filename_key(image_datablock):
-    if not (image_datablock and image_datablock.filepath):
-        return None
-    original_filepath_string = image_datablock.filepath
-    base_filename = os.path.basename(original_filepath_string)
-    if not base_filename:
+    if not image_datablock:
         return None
-    return base_filename.lower()
+    cache_key = image_datablock.as_pointer()
+    if cache_key in _image_key_cache:
+        return _image_key_cache[cache_key]
+
+    filename_key = None
+    if image_datablock.filepath:
+        base_filename = os.path.basename(image_datablock.filepath)
+        if base_filename:
+            filename_key = base_filename.lower()
+
+    _image_key_cache[cache_key] = filename_key
+    return filename_key
+
+RULES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "wtt_rules.json")
+
+DEFAULT_RULES = {
+    "ground": {
+        "discard_names": ["_track", "_mg_", "net_"],
+        "discard_textures": ["glass", "track", "mg", "net"],
+        "textures": [
+            {"all": ["gun"], "category": "gun", "base_name": "Gun"},
+            {"all": ["body", "_add"], "category": "body_add", "base_name": "BodyAdd"},
+            {"all": ["body"], "category": "body", "base_name": "Body"},
+            {"all": ["turret", "_add"], "category": "turret_add", "base_name": "TurretAdd"},
+            {"all": ["turret"], "category": "turret", "base_name": "Turret"},
+        ],
+        "default": {"category": "unknown", "base_name": "Add"},
+    },
+    "air": {
+        "discard_names": [],
+        "discard_textures": ["inside_", "seat_", "interior_"],
+        "textures": [
+            {"all": ["pylon"], "category": "pylon", "base_name": "Pylon"},
+            {"all": ["drop_tank"], "category": "drop_tank", "base_name": "DropTank"},
+        ],
+        "default": {"category": "unknown", "base_name": "Add"},
+        "body_only_discard": ["Pylon", "DropTank"],
+    },
+}
+
+_rules_cache = {}
+
+def compile_rule_matcher(patterns):
+    # One regex finds, at every position of a key, the longest pattern starting there. Shorter
+    # patterns contained in a found one are added from the precomputed closure, so a single
+    # pass over the key yields every pattern that occurs in it.
+    patterns = sorted(set(patterns), key=lambda p: (-len(p), p))
+    if not patterns:
+        return None, {}
+    regex = re.compile("(?=(" + "|".join(re.escape(p) for p in patterns) + "))")
+    implied = {p: frozenset(q for q in patterns if q in p) for p in patterns}
+    return regex, implied
+
+def compile_rules(rules):
+    patterns = []
+    for section in rules.values():
+        patterns.extend(section.get("discard_names", []))
+        patterns.extend(section.get("discard_textures", []))
+        for rule in section.get("textures", []):
+            patterns.extend(rule["all"])
+    regex, implied = compile_rule_matcher(patterns)
+
+    compiled = {"regex": regex, "implied": implied, "classified": {}}
+    for vehicle, section in rules.items():
+        compiled[vehicle] = {
+            "discard_names": list(section.get("discard_names", [])),
+            "discard_textures": list(section.get("discard_textures", [])),
+            "textures": [(frozenset(rule["all"]), rule["category"], rule["base_name"]) for rule in section.get("textures", [])],
+            "default": (section["default"]["category"], section["default"]["base_name"]),
+            "body_only_discard": list(section.get("body_only_discard", [])),
+        }
+    return compiled
+
+def refresh_rules(report=None):
+    # Operators call this once per run; the classification calls in between only read the cache.
+    # When wtt_rules.json can't be read the built-in DEFAULT_RULES are used until it is fixed.
+    try:
+        mtime = os.path.getmtime(RULES_FILE)
+        if _rules_cache.get("mtime") != mtime:
+            with open(RULES_FILE, encoding="utf-8") as f:
+                rules = compile_rules(json.load(f))
+            _rules_cache["rules"] = rules
+            _rules_cache["mtime"] = mtime
+    except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+        _rules_cache["rules"] = compile_rules(DEFAULT_RULES)
+        _rules_cache["mtime"] = None
+        if report:
+            report({'ERROR'}, f"Could not load '{os.path.basename(RULES_FILE)}' ({e}), using the built-in rules.")
+
+def load_rules():
+    if "rules" not in _rules_cache:
+        refresh_rules()
+    return _rules_cache["rules"]
+
+def match_rule_patterns(rules, text):
+    found = set()
+    if rules["regex"]:
+        implied = rules["implied"]
+        for m in rules["regex"].finditer(text):
+            found |= implied[m.group(1)]
+    return found
+
+def classify_texture_key(vehicle, filename_key):
+    rules = load_rules()
+    result = rules["classified"].get((vehicle, filename_key))
+    if result is not None:
+        return result
+
+    section = rules[vehicle]
+    found = match_rule_patterns(rules, filename_key)
+    discard_rule = next((rule for rule in section["discard_textures"] if rule in found), None)
+    result = (discard_rule,) + section["default"]
+    for required, category, base_name in section["textures"]:
+        if required <= found:
+            result = (discard_rule, category, base_name)
+            break
+
+    rules["classified"][(vehicle, filename_key)] = result
+    return result
+
+def get_ground_discard_group(obj_name_lower, filename_key):
+    rules = load_rules()
+    found = match_rule_patterns(rules, obj_name_lower)
+    for rule in rules["ground"]["discard_names"]:
+        if rule in found:
+            return f"[Name] {rule}"
+    if not filename_key:
+        return "[No Texture]"
+    discard_rule = classify_texture_key("ground", filename_key)[0]
+    if discard_rule:
+        return f"[Texture] {discard_rule}"
+    return None
+
+def get_ground_texture_info(filename_key):
+    return classify_texture_key("ground", filename_key)[1:]
+
+def get_air_discard_group(filename_key):
+    if not filename_key:
+        return "[No Texture]"
+    discard_rule = classify_texture_key("air", filename_key)[0]
+    if discard_rule:
+        return f"[Texture] {discard_rule}"
+    return None
+
+def get_air_texture_info(filename_key):
+    return classify_texture_key("air", filename_key)[2]
+
+def is_air_body_only_discard(group_name):
+    return any(base_name in group_name for base_name in load_rules()["air"]["body_only_discard"])
+
+def get_final_mat_names(filepath_to_info):
+    categorized_files = {} 
+    for f_key, info in filepath_to_info.items():
+        base_name = info["base_name"]
+        if base_name not in categorized_files:
+            categorized_files[base_name] = []
+        categorized_files[base_name].append(f_key)
+
+    filename_key_to_final_mat_name = {} 
+    for base_name, filename_key_list in categorized_files.items():
+        sorted_filename_key_list = sorted(set(filename_key_list)) 
+        
+        if len(sorted_filename_key_list) > 1:
+            for i, f_key in enumerate(sorted_filename_key_list):
+                filename_key_to_final_mat_name[f_key] = f"{base_name}_{i + 1}"
+        elif len(sorted_filename_key_list) == 1:
+            filename_key_to_final_mat_name[sorted_filename_key_list[0]] = base_name
+    return filename_key_to_final_mat_name
+
+def plan_ground_groups(entries):
+    keep_map = {}
+    discard_map = {}
+    filepath_to_info = {}
+    item_to_key = []
+
+    for item, name_lower, filename_key in entries:
+        group_name = get_ground_discard_group(name_lower, filename_key)
+        if group_name:
+            discard_map.setdefault(group_name, []).append(item)
+            continue
+
+        item_to_key.append((item, filename_key))
+        if filename_key not in filepath_to_info:
+            category, base_name = get_ground_texture_info(filename_key)
+            filepath_to_info[filename_key] = {"category": category, "base_name": base_name}
+
+    filename_key_to_final_mat_name = get_final_mat_names(filepath_to_info)
+    for item, filename_key in item_to_key:
+        group_name = f"[{filename_key_to_final_mat_name[filename_key]}] ({filename_key})"
+        keep_map.setdefault(group_name, []).append(item)
+
+    return keep_map, discard_map
+
+def plan_air_groups(entries):
+    keep_map = {}
+    discard_map = {}
+    filepath_to_info = {}
+    item_to_key = []
+
+    for item, name_lower, filename_key in entries:
+        group_name = get_air_discard_group(filename_key)
+        if group_name:
+            discard_map.setdefault(group_name, []).append(item)
+            continue
+
+        item_to_key.append((item, filename_key))
+        if filename_key not in filepath_to_info:
+            filepath_to_info[filename_key] = {"base_name": get_air_texture_info(filename_key)}
+
+    filename_key_to_final_mat_name = get_final_mat_names(filepath_to_info)
+    for item, filename_key in item_to_key:
+        group_name = f"[{filename_key_to_final_mat_name[filename_key]}] ({filename_key})"
+        keep_map.setdefault(group_name, []).append(item)
+
+    return keep_map, discard_map
 
 def cleanup_air_scene_props(scene):
     scene.wtt_air_keep_groups.clear()
@@ -116,29 +914,17 @@ def cleanup_air_scene_props(scene):
     scene.wtt_air_keep_list_index = 0
     scene.wtt_air_discard_list_index = 0
     scene.wtt_air_body_name = ""
+    scene.wtt_air_body_confidence = 0.0
 
 def cleanup_air_material_list(scene):
     scene.wtt_air_material_list.clear()
     scene.wtt_air_material_list_index = 0
 
 def get_all_air_objects(context, include_hidden=False):
-    work_collection = bpy.data.collections.get("Aviation_Work")
-    if not work_collection:
-        return []
-    
-    objects_to_process = list(work_collection.objects)
-    collections_to_check = list(work_collection.children)
-    
+    index = get_scene_index("Aviation_Work")
     if include_hidden:
-        hidden_coll = bpy.data.collections.get("Hidden_Air_Items")
-        if hidden_coll:
-            if hidden_coll.name not in work_collection.children:
-                objects_to_process.extend(list(hidden_coll.objects))
-
-    for coll in collections_to_check:
-        objects_to_process.extend(list(coll.objects))
-    
-    return [obj for obj in objects_to_process if obj.type == 'MESH']
+        return index["objects"] + index["hidden_objects"]
+    return list(index["objects"])
 
 class WTT_GroupListItem(PropertyGroup):
     name: StringProperty(name="Group Name")
@@ -261,11 +1047,11 @@ class WTT_OT_MergeGroups(Operator):
         if not objects_to_move:
              self.report({'INFO'}, f"Group '{source_item.name}' is empty, no move needed.")
              
-        for obj in objects_to_move:
-            source_coll.objects.unlink(obj)
-            target_coll.objects.link(obj)
-            
-        bpy.data.collections.remove(source_coll)
+        relink_objects(
+            [(obj, target_coll) for obj in objects_to_move],
+            [source_coll],
+            remove_collections=[source_coll],
+        )
         source_list.remove(s_idx)
         
         setattr(scene, source_index_prop, t_idx)
@@ -311,6 +1097,33 @@ class WTT_OT_MoveGroupItem(Operator):
         
         return {'FINISHED'}
 
+def select_list_objects(context, objects, work_collection_name):
+    # Only the selected objects of the work collection (the previous group) get deselected, so a
+    # selection made outside the work collection is kept.
+    if context.object and context.object.mode != 'OBJECT':
+        bpy.ops.object.mode_set(mode='OBJECT')
+    work_collection = bpy.data.collections.get(work_collection_name)
+    if work_collection:
+        work_objects = work_collection.all_objects
+        for obj in context.selected_objects:
+            if obj.name in work_objects:
+                obj.select_set(False)
+    for obj in objects:
+        obj.select_set(True)
+    if objects:
+        context.view_layer.objects.active = objects[0]
+
+def get_material_group_objects(work_collection_name, get_final_mat_name):
+    # Material name -> objects of the groups using it, kept on the scene index so it is rebuilt
+    # only when the index is.
+    index = get_scene_index(work_collection_name)
+    material_objects = index.get("material_objects")
+    if material_objects is None:
+        material_objects = index["material_objects"] = {}
+        for group_name, obj_list in index["group_objects"].items():
+            material_objects.setdefault(get_final_mat_name(group_name), []).extend(obj_list)
+    return material_objects
+
 def on_list_select_keep(self, context):
     group_name = ""
     if context.scene.wtt_keep_list_index >= 0 and len(context.scene.wtt_keep_groups) > context.scene.wtt_keep_list_index:
@@ -322,13 +1135,7 @@ def on_list_select_keep(self, context):
     obj_list = list(coll.objects)
     if not obj_list: return
 
-    if bpy.context.object and bpy.context.object.mode != 'OBJECT':
-        bpy.ops.object.mode_set(mode='OBJECT')
-    bpy.ops.object.select_all(action='DESELECT')
-    for obj in obj_list:
-        obj.select_set(True)
-    if obj_list: 
-        bpy.context.view_layer.objects.active = obj_list[0]
+    select_list_objects(context, obj_list, "Ground_Work")
 
 def on_list_select_discard(self, context):
     group_name = ""
@@ -341,13 +1148,7 @@ def on_list_select_discard(self, context):
     obj_list = list(coll.objects)
     if not obj_list: return
 
-    if bpy.context.object and bpy.context.object.mode != 'OBJECT':
-        bpy.ops.object.mode_set(mode='OBJECT')
-    bpy.ops.object.select_all(action='DESELECT')
-    for obj in obj_list:
-        obj.select_set(True)
-    if obj_list: 
-        bpy.context.view_layer.objects.active = obj_list[0]
+    select_list_objects(context, obj_list, "Ground_Work")
 
 def on_list_select_material(self, context):
     mat_name = ""
@@ -366,224 +1167,115 @@ def on_list_select_material(self, context):
                     break
             break
             
-    if bpy.context.object and bpy.context.object.mode != 'OBJECT':
-        bpy.ops.object.mode_set(mode='OBJECT')
-    bpy.ops.object.select_all(action='DESELECT')
-    
-    active_obj_set = False
-    
-    work_collection = bpy.data.collections.get("Ground_Work")
-    if not work_collection: return
-    
-    collections_to_check = [coll for coll in work_collection.children]
-    
-    for coll in collections_to_check:
-        coll_mat_name = WTT_OT_AnalyzeMaterial.get_final_mat_name(coll.name)
-        if coll_mat_name == mat_name:
-            for obj in coll.objects:
-                obj.select_set(True)
-                if not active_obj_set:
-                    context.view_layer.objects.active = obj
-                    active_obj_set = True
+    select_list_objects(context, get_material_group_objects("Ground_Work", WTT_OT_AnalyzeMaterial.get_final_mat_name).get(mat_name, []), "Ground_Work")
 
-class WTT_OT_AnalyzeGroups(Operator):
+class WTT_OT_AnalyzeGroups(TimeSlicedOperator, Operator):
     bl_idname = "wtt.analyze_groups"
     bl_label = "Group"
-    bl_description = "Analyze and group objects in the 'Ground_Work' collection"
+    bl_description = "Analyze and group objects in the 'Ground_Work' collection (Esc cancels)"
 
-    def execute(self, context):
+    def rollback(self, context):
+        # Undoes this run's grouping, then restores the grouping cancel_cleanup dissolved.
+        scene = context.scene
+        if self._moves:
+            undo_relink(self._moves, [self._work_collection] * len(self._moves), self._new_collections)
+        cleanup_scene_props(scene)
+
+        new_collections = []
+        moves = []
+        for group_name, objects in self._previous_groups:
+            coll = get_group_collection(group_name, new_collections)
+            moves.extend((obj, coll) for obj in objects)
+        if new_collections:
+            relink_objects(moves, [self._work_collection], self._work_collection, new_collections)
+
+        keep_names, discard_names = self._previous_lists
+        for group_name in keep_names:
+            scene.wtt_keep_groups.add().name = group_name
+        for group_name in discard_names:
+            scene.wtt_discard_groups.add().name = group_name
+
+    def run_steps(self, context):
+        self._moves = []
+        self._new_collections = []
+        self._previous_groups = []
+        self._previous_lists = ([], [])
         scene = context.scene
+        refresh_rules(self.report)
         if "Ground_Work" not in bpy.data.collections:
             self.report({'WARNING'}, "Collection 'Ground_Work' not found.")
             return {'CANCELLED'}
         
-        work_collection = bpy.data.collections["Ground_Work"]
+        work_collection = self._work_collection = bpy.data.collections["Ground_Work"]
         
+        self._previous_groups = [(coll.name, list(coll.objects)) for coll in work_collection.children]
+        self._previous_lists = ([g.name for g in scene.wtt_keep_groups], [g.name for g in scene.wtt_discard_groups])
         bpy.ops.wtt.cancel_cleanup('EXEC_DEFAULT')
         cleanup_scene_props(scene)
+        invalidate_texture_cache()
 
         if not work_collection.objects:
             self.report({'INFO'}, "'Ground_Work' collection is empty.")
             return {'CANCELLED'}
-            
-        DISCARD_OBJ_NAMES = ["_track", "_mg_", "net_"]
-        DISCARD_TEX_NAMES = ["glass", "track", "mg", "net"] 
-
-        discard_map = {} 
-        filepath_to_info = {} 
-        obj_to_key_map = {} 
-        objects_to_classify = [] 
-        
-        objects_to_process = [obj for obj in work_collection.objects]
-
-        for obj in objects_to_process:
-            if obj.type != 'MESH':
-                continue
 
-            found_discard_rule = False
-            obj_name_lower = obj.name.lower()
+        plan = load_group_plan(scene, "GROUND") if scene.wtt_use_plan_cache else None
+        if plan:
+            grouped_count, ungrouped_count = apply_cached_group_plan(context, plan)
+            self.report({'INFO'}, f"Applied the saved plan of this model: {grouped_count} objects grouped ({ungrouped_count} not in the plan).")
+            return {'FINISHED'}
             
-            for rule in DISCARD_OBJ_NAMES:
-                if rule in obj_name_lower:
-                    group_name = f"[Name] {rule}"
-                    if group_name not in discard_map:
-                        discard_map[group_name] = []
-                    discard_map[group_name].append(obj)
-                    found_discard_rule = True
-                    break
-            if found_discard_rule:
-                continue
+        index = yield from scale_progress(iter_scene_index(work_collection.name), 0.0, 0.5)
+        entries = get_ungrouped_entries(index)
+        profile_count("objects_touched", len(entries))
 
-            image_datablock = get_base_color_texture_from_obj(obj)
-            tex_filename = get_texture_filename_key(image_datablock)
-
-            if tex_filename:
-                for rule in DISCARD_TEX_NAMES:
-                    if rule in tex_filename:
-                        group_name = f"[Texture] {rule}"
-                        if group_name not in discard_map:
-                            discard_map[group_name] = []
-                        discard_map[group_name].append(obj)
-                        found_discard_rule = True
-                        break
-                if found_discard_rule:
-                    continue
-                
-                objects_to_classify.append(obj)
-                
-            else:
-                group_name = "[No Texture]"
-                if group_name not in discard_map:
-                    discard_map[group_name] = []
-                discard_map[group_name].append(obj)
-        
-        for obj in objects_to_classify:
-            image_datablock = get_base_color_texture_from_obj(obj)
-            if not image_datablock:
-                continue
-            
-            filename_key = get_texture_filename_key(image_datablock)
-            if not filename_key:
-                continue
-
-            obj_to_key_map[obj.name] = filename_key
-
-            if filename_key in filepath_to_info:
-                continue
+        final_keep_groups_map, discard_map = plan_ground_groups(entries)
 
-            current_category = None
-            current_base_name = None
+        moves = self._moves
+        new_collections = self._new_collections
+        for group_map, target_list in ((final_keep_groups_map, scene.wtt_keep_groups), (discard_map, scene.wtt_discard_groups)):
+            for group_name in sorted(group_map.keys()):
+                target_list.add().name = group_name
+                new_coll = get_group_collection(group_name, new_collections)
+                moves.extend((obj, new_coll) for obj in group_map[group_name])
 
-            if "gun" in filename_key:
-                current_category = "gun"
-                current_base_name = "Gun"
-            elif "body" in filename_key:
-                if "_add" in filename_key:
-                    current_category = "body_add"
-                    current_base_name = "BodyAdd"
-                else:
-                    current_category = "body"
-                    current_base_name = "Body"
-            elif "turret" in filename_key:
-                if "_add" in filename_key:
-                    current_category = "turret_add"
-                    current_base_name = "TurretAdd"
-                else:
-                    current_category = "turret"
-                    current_base_name = "Turret"
-            else:
-                current_category = "unknown"
-                current_base_name = "Add" 
-            
-            if current_category:
-                filepath_to_info[filename_key] = {
-                    "category": current_category, 
-                    "base_name": current_base_name,
-                }
-        
-        categorized_files = {} 
-        for f_key, info in filepath_to_info.items():
-            base_name = info["base_name"]
-            if base_name not in categorized_files:
-                categorized_files[base_name] = []
-            categorized_files[base_name].append(f_key)
-
-        filename_key_to_final_mat_name = {} 
-        for base_name, filename_key_list in categorized_files.items():
-            if not filename_key_list:
-                continue
-            
-            sorted_filename_key_list = sorted(list(set(filename_key_list))) 
-            
-            if len(sorted_filename_key_list) > 1:
-                for i, f_key in enumerate(sorted_filename_key_list):
-                    suffix = str(i + 1)
-                    final_name = f"{base_name}_{suffix}"
-                    filename_key_to_final_mat_name[f_key] = final_name
-            elif len(sorted_filename_key_list) == 1:
-                final_name = base_name 
-                filename_key_to_final_mat_name[sorted_filename_key_list[0]] = final_name
-
-        final_keep_groups_map = {} 
-        for obj_name, tex_key in obj_to_key_map.items():
-            obj = bpy.data.objects.get(obj_name)
-            if not obj: continue
-            
-            final_name = filename_key_to_final_mat_name.get(tex_key)
-            if not final_name: continue
-            
-            if tex_key in filepath_to_info:
-                group_name = f"[{final_name}] ({tex_key})"
-            else:
-                group_name = f"[{final_name}]"
-                
-            if group_name not in final_keep_groups_map:
-                final_keep_groups_map[group_name] = []
-            final_keep_groups_map[group_name].append(obj)
-
-        for group_name in sorted(final_keep_groups_map.keys()):
-            obj_list = final_keep_groups_map[group_name]
-            scene.wtt_keep_groups.add().name = group_name
-            self.move_objects_to_subcollection(work_collection, group_name, obj_list)
-
-        for group_name in sorted(discard_map.keys()):
-            obj_list = discard_map[group_name]
-            scene.wtt_discard_groups.add().name = group_name
-            self.move_objects_to_subcollection(work_collection, group_name, obj_list)
+        yield from scale_progress(iter_relink_objects(moves, [work_collection], work_collection, new_collections), 0.5, 1.0)
         
         self.report({'INFO'}, "Grouping complete.")
         return {'FINISHED'}
 
-    def move_objects_to_subcollection(self, work_collection, group_name, obj_list):
-        if group_name not in bpy.data.collections:
-            new_coll = bpy.data.collections.new(group_name)
-            work_collection.children.link(new_coll)
-        else:
-            new_coll = bpy.data.collections[group_name]
-
-        for obj in obj_list:
-            if obj.name in work_collection.objects:
-                work_collection.objects.unlink(obj)
-            if obj.name not in new_coll.objects:
-                new_coll.objects.link(obj)
-
-class WTT_OT_ExecuteCleanup(Operator):
+class WTT_OT_ExecuteCleanup(TimeSlicedOperator, Operator):
     bl_idname = "wtt.execute_cleanup"
     bl_label = "Execute"
-    bl_description = "Execute Cleanup Operation"
-
-    def execute(self, context):
+    bl_description = "Execute Cleanup Operation (Esc cancels before anything is deleted)"
+
+    def rollback(self, context):
+        if self._moves:
+            undo_relink(self._moves, self._sources, self._new_collections)
+        keep_groups = context.scene.wtt_keep_groups
+        for i, old_name, new_name in reversed(self._renames):
+            coll = bpy.data.collections.get(new_name)
+            if coll:
+                coll.name = old_name
+            keep_groups[i].name = old_name
+
+    def run_steps(self, context):
         scene = context.scene
+        self._renames = []
+        self._moves = []
+        self._sources = []
+        self._new_collections = []
         work_collection = bpy.data.collections.get("Ground_Work")
         
         if not work_collection:
             self.report({'ERROR'}, "Collection 'Ground_Work' not found.")
             return {'CANCELLED'}
         
+        group_plan = get_group_plan(scene, "GROUND")
+
         base_name_map = {}
-        keep_items = list(scene.wtt_keep_groups) 
+        keep_items = list(enumerate(scene.wtt_keep_groups))
 
-        for item in keep_items:
+        for item_index, item in keep_items:
             old_name = item.name
             if not (old_name.startswith("[") and "]" in old_name):
                 continue
@@ -593,12 +1285,12 @@ class WTT_OT_ExecuteCleanup(Operator):
             
             if base_name not in base_name_map:
                 base_name_map[base_name] = []
-            base_name_map[base_name].append(item)
+            base_name_map[base_name].append((item_index, item))
 
         for base_name, items_list in base_name_map.items():
             is_multi_item = len(items_list) > 1
             
-            for i, item in enumerate(items_list):
+            for i, (item_index, item) in enumerate(items_list):
                 old_coll_name = item.name
                 coll = bpy.data.collections.get(old_coll_name)
                 
@@ -617,6 +1309,8 @@ class WTT_OT_ExecuteCleanup(Operator):
                     item.name = new_coll_name
                     if coll:
                         coll.name = new_coll_name
+                    self._renames.append((item_index, old_coll_name, item.name))
+        yield 0.1
 
         if not scene.wtt_keep_groups and not scene.wtt_discard_groups:
             self.report({'INFO'}, "Lists are empty, nothing to execute.")
@@ -625,50 +1319,49 @@ class WTT_OT_ExecuteCleanup(Operator):
         discard_group_names = [g.name for g in scene.wtt_discard_groups]
 
         if scene.wtt_hide_not_delete:
-            hidden_collection_name = "Hidden_Items"
-            if hidden_collection_name not in bpy.data.collections:
-                hidden_collection = bpy.data.collections.new(hidden_collection_name)
-                if hidden_collection.name not in bpy.context.scene.collection.children:
-                    bpy.context.scene.collection.children.link(hidden_collection)
-            else:
-                hidden_collection = bpy.data.collections[hidden_collection_name]
+            new_collections = []
+            hidden_collection = get_group_collection("Hidden_Items", new_collections)
             
-            count = 0
+            colls_to_discard = []
             for group_name in discard_group_names:
                 coll_to_discard = bpy.data.collections.get(group_name)
-                
                 if coll_to_discard and coll_to_discard.name in work_collection.children:
-                    objects_to_move = [obj for obj in coll_to_discard.objects]
-                    for obj in objects_to_move:
-                        coll_to_discard.objects.unlink(obj)
-                        hidden_collection.objects.link(obj)
-                        count += 1
-                    bpy.data.collections.remove(coll_to_discard)
+                    colls_to_discard.append(coll_to_discard)
+
+            moves = self._moves
+            for coll in colls_to_discard:
+                for obj in coll.objects:
+                    moves.append((obj, hidden_collection))
+                    self._sources.append(coll)
+            self._new_collections = new_collections
+            count = len(moves)
+            yield from scale_progress(iter_relink_objects(moves, colls_to_discard, bpy.context.scene.collection, new_collections, colls_to_discard), 0.1, 1.0)
             
+            profile_count("objects_touched", count)
             self.report({'INFO'}, f"Moved {count} objects to 'Hidden_Items'.")
 
         else:
             objects_to_delete = []
             collections_to_delete = []
             
-            for group_name in discard_group_names:
+            for i, group_name in enumerate(discard_group_names):
                 coll_to_delete = bpy.data.collections.get(group_name)
                 if coll_to_delete:
                     collections_to_delete.append(coll_to_delete)
                     for obj in coll_to_delete.objects:
                         objects_to_delete.append(obj)
+                yield 0.1 + 0.8 * (i + 1) / len(discard_group_names)
             
-            count = len(objects_to_delete)
-            if objects_to_delete:
-                for obj in objects_to_delete:
-                    bpy.data.objects.remove(obj, do_unlink=True)
+            # The delete itself is one batch and cannot be interrupted.
+            count, freed_bytes = delete_objects_and_orphans(objects_to_delete, collections_to_delete)
+            profile_count("objects_touched", count)
                 
-            for coll in collections_to_delete:
-                bpy.data.collections.remove(coll)
-                
-            self.report({'INFO'}, f"Deleted {count} objects.")
+            self.report({'INFO'}, f"Deleted {count} objects, freed ~{freed_bytes / 1048576:.1f} MB of mesh and image data.")
 
         cleanup_scene_props(scene)
+        plan_error = save_group_plan(scene, group_plan)
+        if plan_error:
+            self.report({'WARNING'}, plan_error)
         self.report({'INFO'}, "Cleanup operation complete.")
         return {'FINISHED'}
 
@@ -686,26 +1379,480 @@ class WTT_OT_CancelCleanup(Operator):
             return {'CANCELLED'}
 
         collections_to_dissolve = [coll for coll in work_collection.children]
-        count = 0
+        moves = [(obj, work_collection) for coll in collections_to_dissolve for obj in coll.objects]
+        count = len(moves)
         
-        for coll in collections_to_dissolve:
-            objects_to_move = [obj for obj in coll.objects]
-            for obj in objects_to_move:
-                coll.objects.unlink(obj)
-                work_collection.objects.link(obj)
-                count += 1
-            bpy.data.collections.remove(coll)
+        if collections_to_dissolve:
+            relink_objects(
+                moves,
+                [work_collection] + collections_to_dissolve,
+                remove_collections=collections_to_dissolve,
+            )
 
         cleanup_scene_props(scene)
         if count > 0:
             self.report({'INFO'}, "Operation cancelled, models moved back to main group.")
         return {'FINISHED'}
 
-class WTT_OT_ImportModel(Operator):
+OBJ_SCAN_PATTERN = re.compile(rb"^(o|g|usemtl|mtllib)[ \t]+([^\r\n]*)", re.M)
+
+def count_obj_lines(segment, keyword, at_line_start=True):
+    # Counts the lines starting with keyword and a space or tab with C-level bytes.count. A line
+    # at the very start of segment has no "\n" before it and is checked on its own, if segment
+    # starts at a line start. Used for the scan's face counts and the selective import's v/vt/vn
+    # numbering, so both read the file the same way.
+    count = segment.count(b"\n" + keyword + b" ") + segment.count(b"\n" + keyword + b"\t")
+    if at_line_start and segment.startswith(keyword) and segment[len(keyword):len(keyword) + 1] in (b" ", b"\t"):
+        count += 1
+    return count
+
+def get_vehicle_group_lists(scene, vehicle):
+    if vehicle == "AIR":
+        return "Aviation_Work", scene.wtt_air_keep_groups, scene.wtt_air_discard_groups
+    return "Ground_Work", scene.wtt_keep_groups, scene.wtt_discard_groups
+
+def scan_mtl_file(mtl_path):
+    textures = {}
+    fallback_textures = {}
+    current_mat = None
+
+    with open(mtl_path, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            parts = line.strip().split(None, 1)
+            if len(parts) < 2:
+                continue
+            keyword = parts[0].lower()
+            if keyword == "newmtl":
+                current_mat = parts[1].strip()
+                textures.setdefault(current_mat, None)
+            elif keyword.startswith("map_") and current_mat is not None:
+                tex_path = parts[1].strip()
+                if tex_path.startswith("-"):
+                    tex_path = tex_path.split()[-1]
+                filename_key = os.path.basename(tex_path.replace("\\", "/")).lower() or None
+                if keyword == "map_kd":
+                    textures[current_mat] = filename_key
+                else:
+                    fallback_textures.setdefault(current_mat, filename_key)
+
+    for mat_name, filename_key in fallback_textures.items():
+        if not textures.get(mat_name):
+            textures[mat_name] = filename_key
+    return textures
+
+def scan_obj_file(obj_path):
+    obj_dir = os.path.dirname(obj_path)
+    current_group = os.path.splitext(os.path.basename(obj_path))[0]
+    groups = {}
+    mtl_files = []
+
+    def get_group(name):
+        if name not in groups:
+            groups[name] = {"materials": [], "faces": 0}
+        return groups[name]
+
+    with open(obj_path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            segment_start = 0
+            for match in OBJ_SCAN_PATTERN.finditer(mm):
+                face_count = count_obj_lines(mm[segment_start:match.start()], b"f", segment_start == 0)
+                if face_count:
+                    get_group(current_group)["faces"] += face_count
+                segment_start = match.end()
+
+                keyword = match.group(1)
+                value = match.group(2).decode("utf-8", "replace").strip()
+                if not value:
+                    continue
+                if keyword in (b"o", b"g"):
+                    current_group = value
+                elif keyword == b"usemtl":
+                    materials = get_group(current_group)["materials"]
+                    if value not in materials:
+                        materials.append(value)
+                else:
+                    mtl_files.append(os.path.join(obj_dir, value))
+
+            face_count = count_obj_lines(mm[segment_start:], b"f", segment_start == 0)
+            if face_count:
+                get_group(current_group)["faces"] += face_count
+
+    if not mtl_files:
+        mtl_files.append(os.path.splitext(obj_path)[0] + ".mtl")
+
+    textures = {}
+    for mtl_path in mtl_files:
+        if os.path.isfile(mtl_path):
+            textures.update(scan_mtl_file(mtl_path))
+
+    for group in groups.values():
+        group["texture"] = next((textures[m] for m in group["materials"] if textures.get(m)), None)
+
+    return {"source": obj_path, "groups": groups}
+
+def build_scan_plan(scan, vehicle, keep_body_only=False):
+    entries = [
+        (name, name.lower(), group["texture"])
+        for name, group in scan["groups"].items() if group["faces"]
+    ]
+
+    if vehicle == "AIR":
+        keep_map, discard_map = plan_air_groups(entries)
+        if keep_body_only:
+            for group_name in [g for g in keep_map if is_air_body_only_discard(g)]:
+                discard_map[group_name] = keep_map.pop(group_name)
+    else:
+        keep_map, discard_map = plan_ground_groups(entries)
+
+    groups = {**keep_map, **discard_map}
+    return {
+        "source": scan["source"],
+        "vehicle": vehicle,
+        "keep": sorted(keep_map),
+        "discard": sorted(discard_map),
+        "groups": groups,
+        "faces": {g: sum(scan["groups"][n]["faces"] for n in names) for g, names in groups.items()},
+    }
+
+def get_plan_object_map(plan):
+    obj_to_group = {}
+    for group_name, obj_names in plan["groups"].items():
+        for obj_name in obj_names:
+            obj_to_group[obj_name] = group_name
+            obj_to_group.setdefault(obj_name.encode("utf-8")[:63].decode("utf-8", "ignore"), group_name)
+    return obj_to_group
+
+def apply_group_plan(context, plan, keep_names, discard_names, group_keep=None):
+    scene = context.scene
+    vehicle = plan["vehicle"]
+    work_collection_name, keep_list, discard_list = get_vehicle_group_lists(scene, vehicle)
+    work_collection = bpy.data.collections[work_collection_name]
+    obj_to_group = get_plan_object_map(plan)
+
+    # Air keep groups of a scan plan stay in the work collection for Specify Body / Group Others.
+    if group_keep is None:
+        group_keep = vehicle != "AIR"
+    grouped_names = set(discard_names)
+    if group_keep:
+        grouped_names.update(keep_names)
+
+    group_objects = {}
+    ungrouped_count = 0
+    for obj in list(work_collection.objects):
+        if obj.type != 'MESH':
+            continue
+        group_name = obj_to_group.get(obj.name) or obj_to_group.get(re.sub(r"\.\d{3,}$", "", obj.name))
+        if not group_name:
+            ungrouped_count += 1
+        elif group_name in grouped_names:
+            group_objects.setdefault(group_name, []).append(obj)
+
+    keep_list.clear()
+    discard_list.clear()
+    moves = []
+    new_collections = []
+    for names, target_list in ((keep_names, keep_list), (discard_names, discard_list)):
+        for group_name in names:
+            obj_list = group_objects.get(group_name)
+            if not obj_list:
+                continue
+            target_list.add().name = group_name
+
+            new_coll = get_group_collection(group_name, new_collections)
+            moves.extend((obj, new_coll) for obj in obj_list)
+
+    relink_objects(moves, [work_collection], work_collection, new_collections)
+
+    return sum(len(objs) for objs in group_objects.values()), ungrouped_count
+
+def get_source_hash(obj_path):
+    sha = hashlib.sha1()
+    mtl_path = os.path.splitext(obj_path)[0] + ".mtl"
+    for path in (obj_path, mtl_path):
+        if not os.path.isfile(path):
+            continue
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                sha.update(chunk)
+    return sha.hexdigest()
+
+def set_source_model(scene, obj_path):
+    scene.wtt_source_obj = obj_path
+    scene.wtt_source_hash = get_source_hash(obj_path) if obj_path and os.path.isfile(obj_path) else ""
+
+def get_plan_cache_path(source_hash):
+    cache_dir = bpy.utils.user_resource('CONFIG', path="wtt_cache", create=True)
+    return os.path.join(cache_dir, f"{source_hash}.json")
+
+def get_group_plan(scene, vehicle):
+    # Read before the cleanup changes the lists; only saved by save_group_plan once it succeeded.
+    if not scene.wtt_source_hash:
+        return None
+    work_collection_name, keep_list, discard_list = get_vehicle_group_lists(scene, vehicle)
+
+    groups = {}
+    for item in list(keep_list) + list(discard_list):
+        coll = bpy.data.collections.get(item.name)
+        if coll:
+            groups[item.name] = [obj.name for obj in coll.objects if obj.type == 'MESH']
+
+    plan = {
+        "hash": scene.wtt_source_hash,
+        "source": scene.wtt_source_obj,
+        "vehicle": vehicle,
+        "keep": [g.name for g in keep_list],
+        "discard": [g.name for g in discard_list],
+        "groups": groups,
+        "body": scene.wtt_air_body_name if vehicle == "AIR" else "",
+    }
+    return plan
+
+def save_group_plan(scene, plan):
+    # Returns an error message when the plan cache can't be written, None otherwise.
+    if plan is None:
+        return None
+    scene.wtt_obj_map_json = json.dumps(plan, ensure_ascii=False)
+    try:
+        with open(get_plan_cache_path(plan["hash"]), "w", encoding="utf-8") as f:
+            json.dump(plan, f, ensure_ascii=False)
+    except OSError as e:
+        return f"Could not write the group plan cache ({e}), the grouping will not be reused."
+    return None
+
+def load_group_plan(scene, vehicle):
+    source_hash = scene.wtt_source_hash
+    if not source_hash:
+        return None
+
+    try:
+        plan = json.loads(scene.wtt_obj_map_json or "{}")
+    except ValueError:
+        plan = {}
+    if plan.get("hash") != source_hash:
+        cache_path = get_plan_cache_path(source_hash)
+        if not os.path.isfile(cache_path):
+            return None
+        try:
+            with open(cache_path, encoding="utf-8") as f:
+                plan = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    if plan.get("hash") != source_hash or plan.get("vehicle") != vehicle:
+        return None
+    return plan
+
+def apply_cached_group_plan(context, plan):
+    scene = context.scene
+    grouped_count, ungrouped_count = apply_group_plan(context, plan, plan["keep"], plan["discard"], group_keep=True)
+    if plan["vehicle"] == "AIR" and plan.get("body"):
+        scene.wtt_air_body_name = plan["body"]
+    return grouped_count, ungrouped_count
+
+OBJ_FACE_LINE_PATTERN = re.compile(rb"^[flp][ \t][^\r\n]*", re.M)
+
+def get_obj_segments(mm, default_group):
+    segments = []
+    current_group = default_group
+    start = 0
+    for match in OBJ_SCAN_PATTERN.finditer(mm):
+        segments.append((start, match.start(), current_group))
+        value = match.group(2).decode("utf-8", "replace").strip()
+        if match.group(1) in (b"o", b"g") and value:
+            current_group = value
+        start = match.start()
+    segments.append((start, len(mm), current_group))
+    return segments
+
+def write_filtered_obj(src_path, dst_path, discard_obj_names):
+    default_group = os.path.splitext(os.path.basename(src_path))[0]
+    element_keywords = (b"v", b"vt", b"vn")
+    src_dir = os.path.dirname(os.path.abspath(src_path))
+    dst_dir = os.path.dirname(os.path.abspath(dst_path))
+
+    def relocate_mtllib(segment):
+        # A copy written to another folder points its mtllib back at the source's MTL, so the
+        # textures still resolve relative to the source folder.
+        if src_dir == dst_dir or not segment.startswith(b"mtllib"):
+            return segment
+        line_end = segment.find(b"\n")
+        if line_end < 0:
+            line_end = len(segment)
+        mtl_name = segment[6:line_end].strip().decode("utf-8", "surrogateescape")
+        mtl_path = os.path.relpath(os.path.join(src_dir, mtl_name), dst_dir)
+        return b"mtllib " + mtl_path.encode("utf-8", "surrogateescape") + segment[line_end:]
+
+    with open(src_path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            segments = get_obj_segments(mm, default_group)
+
+            keep_masks = ([], [], [])
+            for start, end, group_name in segments:
+                segment = mm[start:end]
+                is_kept = group_name not in discard_obj_names
+                for mask, keyword in zip(keep_masks, element_keywords):
+                    mask.append(np.full(count_obj_lines(segment, keyword), is_kept, dtype=bool))
+
+            index_maps = []
+            for mask_parts in keep_masks:
+                mask = np.concatenate(mask_parts) if mask_parts else np.zeros(0, dtype=bool)
+                index_maps.append(memoryview(np.where(mask, np.cumsum(mask), 0).astype(np.int32)))
+
+            def remap_face_line(match):
+                parts = match.group(0).split()
+                for i in range(1, len(parts)):
+                    fields = parts[i].split(b"/")
+                    for j, field in enumerate(fields):
+                        if not field:
+                            continue
+                        old_index = int(field)
+                        new_index = index_maps[j][old_index - 1] if old_index > 0 else 0
+                        if not new_index:
+                            raise ValueError("Kept faces reference discarded or relative vertex data.")
+                        fields[j] = b"%d" % new_index
+                    parts[i] = b"/".join(fields)
+                return b" ".join(parts)
+
+            dropped_before = [0, 0, 0]
+            with open(dst_path, "wb", buffering=1 << 20) as out:
+                for (start, end, group_name), *segment_masks in zip(segments, *keep_masks):
+                    segment = mm[start:end]
+                    if group_name in discard_obj_names:
+                        if segment.startswith(b"mtllib"):
+                            out.write(relocate_mtllib(segment[:segment.find(b"\n") + 1] or segment))
+                        for k, mask in enumerate(segment_masks):
+                            dropped_before[k] += len(mask)
+                        continue
+
+                    if any(dropped_before):
+                        segment = OBJ_FACE_LINE_PATTERN.sub(remap_face_line, segment)
+                    out.write(relocate_mtllib(segment))
+
+def write_selective_obj(src_path, discard_obj_names):
+    # The filtered copy goes into a fresh temp folder, never next to the source, where it could
+    # overwrite a user file or be picked up as another vehicle if Blender dies before cleanup.
+    # Returns (temp_dir, obj_path); the caller removes temp_dir once the import is done.
+    temp_dir = tempfile.mkdtemp(prefix="wtt_selective_")
+    dst_path = os.path.join(temp_dir, os.path.basename(src_path))
+    try:
+        write_filtered_obj(src_path, dst_path, discard_obj_names)
+    except BaseException:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        raise
+    return temp_dir, dst_path
+
+class WTT_OT_ScanModel(Operator, ImportHelper):
+    bl_idname = "wtt.scan_model"
+    bl_label = "Scan .obj"
+    bl_description = "Read the group and texture names of an .obj/.mtl pair and prepare the Keep/Discard plan without importing any geometry"
+
+    filename_ext = ".obj"
+    filter_glob: StringProperty(default="*.obj", options={'HIDDEN'})
+    vehicle: StringProperty(default="GROUND")
+
+    def execute(self, context):
+        scene = context.scene
+        start = time.perf_counter()
+        refresh_rules(self.report)
+
+        try:
+            scan = scan_obj_file(self.filepath)
+        except (OSError, ValueError) as e:
+            self.report({'ERROR'}, f"Could not read '{self.filepath}': {e}")
+            return {'CANCELLED'}
+
+        plan = build_scan_plan(scan, self.vehicle, keep_body_only=scene.wtt_air_keep_body_only)
+        if not plan["groups"]:
+            self.report({'WARNING'}, "No faces found in the .obj file.")
+            return {'CANCELLED'}
+
+        if self.vehicle == "AIR":
+            bpy.ops.wtt.air_cancel_cleanup('EXEC_DEFAULT')
+            cleanup_air_scene_props(scene)
+        else:
+            bpy.ops.wtt.cancel_cleanup('EXEC_DEFAULT')
+            cleanup_scene_props(scene)
+
+        work_collection_name, keep_list, discard_list = get_vehicle_group_lists(scene, self.vehicle)
+        for group_name in plan["keep"]:
+            keep_list.add().name = group_name
+        for group_name in plan["discard"]:
+            discard_list.add().name = group_name
+        scene.wtt_scan_plan_json = json.dumps(plan)
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.report({'INFO'}, f"Scanned {len(plan['groups'])} groups in {elapsed_ms:.1f} ms: {len(plan['keep'])} to keep, {len(plan['discard'])} to discard. Adjust the lists, then import.")
+        return {'FINISHED'}
+
+class WTT_OT_ImportScanned(Operator):
+    bl_idname = "wtt.import_scanned"
+    bl_label = "Import Scanned"
+    bl_description = "Import the scanned .obj and group it according to the current Keep/Discard lists"
+
+    vehicle: StringProperty(default="GROUND")
+
+    def execute(self, context):
+        scene = context.scene
+        plan = json.loads(scene.wtt_scan_plan_json or "{}")
+        if plan.get("vehicle") != self.vehicle:
+            self.report({'WARNING'}, "No scanned model, please use 'Scan .obj' first.")
+            return {'CANCELLED'}
+
+        work_collection_name, keep_list, discard_list = get_vehicle_group_lists(scene, self.vehicle)
+        work_collection = bpy.data.collections.get(work_collection_name)
+        if not work_collection:
+            self.report({'ERROR'}, f"Collection '{work_collection_name}' not found.")
+            return {'CANCELLED'}
+
+        keep_names = [g.name for g in keep_list]
+        discard_names = [g.name for g in discard_list]
+
+        layer_collection = context.view_layer.layer_collection.children.get(work_collection.name)
+        if layer_collection:
+            context.view_layer.active_layer_collection = layer_collection
+
+        import_path = plan["source"]
+        temp_dir = None
+        skipped_groups = 0
+        if scene.wtt_selective_import and discard_names:
+            discard_obj_names = set()
+            for group_name in discard_names:
+                discard_obj_names.update(plan["groups"].get(group_name, []))
+
+            try:
+                temp_dir, import_path = write_selective_obj(plan["source"], discard_obj_names)
+                skipped_groups = len(discard_names)
+            except (OSError, ValueError) as e:
+                self.report({'WARNING'}, f"Selective import not possible ({e}), importing everything.")
+
+        try:
+            result = bpy.ops.wm.obj_import(filepath=import_path, use_split_groups=True)
+            profile_count("ops_calls")
+        finally:
+            if temp_dir:
+                shutil.rmtree(temp_dir, ignore_errors=True)
+            invalidate_scene_index()
+
+        if 'FINISHED' not in result:
+            self.report({'ERROR'}, f"Import of '{plan['source']}' failed.")
+            return {'CANCELLED'}
+
+        set_source_model(scene, plan["source"])
+        grouped_count, ungrouped_count = apply_group_plan(context, plan, keep_names, discard_names)
+        if skipped_groups:
+            self.report({'INFO'}, f"Imported and grouped {grouped_count} objects, skipped {skipped_groups} discarded groups ({ungrouped_count} not in the plan).")
+        else:
+            self.report({'INFO'}, f"Imported and grouped {grouped_count} objects ({ungrouped_count} not in the plan).")
+        return {'FINISHED'}
+
+class WTT_OT_ImportModel(Operator, ImportHelper):
     bl_idname = "wtt.import_model"
     bl_label = "Import .obj"
-    bl_description = "Open .obj import window"
+    bl_description = "Import an .obj split by group into the work collection"
     
+    filename_ext = ".obj"
+    filter_glob: StringProperty(default="*.obj", options={'HIDDEN'})
+
     def execute(self, context):
         work_collection = bpy.data.collections.get("Ground_Work")
         if work_collection:
@@ -713,14 +1860,587 @@ class WTT_OT_ImportModel(Operator):
             if layer_collection:
                 bpy.context.view_layer.active_layer_collection = layer_collection
         
-        bpy.ops.wm.obj_import('INVOKE_DEFAULT')
-        
+        result = bpy.ops.wm.obj_import(filepath=self.filepath, use_split_groups=True)
+        profile_count("ops_calls")
+        invalidate_scene_index()
+        if 'FINISHED' not in result:
+            self.report({'ERROR'}, f"Import of '{self.filepath}' failed.")
+            return {'CANCELLED'}
+
+        set_source_model(context.scene, self.filepath)
         return {'FINISHED'}
 
-class WTT_OT_ExportModel(Operator):
+OBJ_WRITE_CHUNK = 65536
+
+# Blender is Z-up, the exported .obj is Y-up (same axes as the default .obj exporter).
+OBJ_AXIS_MATRIX = np.array([[1.0, 0.0, 0.0], [0.0, 0.0, 1.0], [0.0, -1.0, 0.0]])
+
+def get_object_export_arrays(obj, depsgraph):
+    # The evaluated mesh carries the modifier results; it is freed again once its arrays are read.
+    eval_obj = obj.evaluated_get(depsgraph)
+    mesh = eval_obj.to_mesh()
+    try:
+        return get_mesh_export_arrays(obj, mesh)
+    finally:
+        eval_obj.to_mesh_clear()
+
+def get_mesh_export_arrays(obj, mesh):
+    face_count = len(mesh.polygons)
+    if not face_count:
+        return None
+
+    matrix = np.array(obj.matrix_world, dtype=np.float64)
+    rotation = OBJ_AXIS_MATRIX @ matrix[:3, :3]
+    normal_matrix = OBJ_AXIS_MATRIX @ np.linalg.inv(matrix[:3, :3]).T
+
+    positions = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", positions)
+    positions = positions.reshape(-1, 3) @ rotation.T + OBJ_AXIS_MATRIX @ matrix[:3, 3]
+
+    loop_count = len(mesh.loops)
+    loop_verts = np.empty(loop_count, dtype=np.int32)
+    mesh.loops.foreach_get("vertex_index", loop_verts)
+    loop_starts = np.empty(face_count, dtype=np.int32)
+    mesh.polygons.foreach_get("loop_start", loop_starts)
+    loop_totals = np.empty(face_count, dtype=np.int32)
+    mesh.polygons.foreach_get("loop_total", loop_totals)
+    face_mat_indices = np.empty(face_count, dtype=np.int32)
+    mesh.polygons.foreach_get("material_index", face_mat_indices)
+
+    normals = np.empty(loop_count * 3, dtype=np.float32)
+    mesh.corner_normals.foreach_get("vector", normals)
+    normals = normals.reshape(-1, 3) @ normal_matrix.T
+    lengths = np.linalg.norm(normals, axis=1)
+    normals /= np.where(lengths > 0.0, lengths, 1.0)[:, None]
+    normals, loop_normals = np.unique(np.round(normals, 4), axis=0, return_inverse=True)
+
+    uvs = None
+    loop_uvs = None
+    if mesh.uv_layers.active:
+        uvs = np.empty(loop_count * 2, dtype=np.float32)
+        mesh.uv_layers.active.data.foreach_get("uv", uvs)
+        uvs, loop_uvs = np.unique(np.round(uvs.reshape(-1, 2), 6), axis=0, return_inverse=True)
+        loop_uvs = loop_uvs.reshape(-1)
+
+    material_names = [slot.material.name if slot.material else None for slot in obj.material_slots]
+    if not material_names:
+        material_names = [None]
+    face_mat_indices = np.clip(face_mat_indices, 0, len(material_names) - 1)
+
+    loop_normals = loop_normals.reshape(-1)
+    # The writer takes each face's loops as one run in polygon order; loops are gathered through
+    # loop_start when the mesh stores them differently. A mirroring transform turns the faces
+    # inside out, so then each face's loops are also taken in reverse.
+    face_starts = np.cumsum(loop_totals) - loop_totals
+    is_mirrored = np.linalg.det(matrix[:3, :3]) < 0.0
+    if is_mirrored or not np.array_equal(loop_starts, face_starts):
+        face_ids = np.repeat(np.arange(face_count), loop_totals)
+        corners = np.arange(len(face_ids)) - face_starts[face_ids]
+        if is_mirrored:
+            corners = loop_totals[face_ids] - 1 - corners
+        loop_order = loop_starts[face_ids] + corners
+        loop_verts = loop_verts[loop_order]
+        loop_normals = loop_normals[loop_order]
+        if loop_uvs is not None:
+            loop_uvs = loop_uvs[loop_order]
+
+    return {
+        "name": obj.name,
+        "positions": positions,
+        "normals": normals,
+        "uvs": uvs,
+        "loop_verts": loop_verts,
+        "loop_normals": loop_normals,
+        "loop_uvs": loop_uvs,
+        "loop_totals": loop_totals,
+        "face_mat_indices": face_mat_indices,
+        "material_names": material_names,
+    }
+
+def write_obj_rows(fh, keyword, rows, fmt):
+    line_fmt = f"{keyword} {fmt}\n"
+    for i in range(0, len(rows), OBJ_WRITE_CHUNK):
+        chunk = rows[i:i + OBJ_WRITE_CHUNK]
+        fh.write((line_fmt * len(chunk)) % tuple(chunk.ravel().tolist()))
+
+def write_obj_faces(fh, loop_indices, loop_totals):
+    face_templates = {}
+    stride = loop_indices.shape[1]
+    token = " %d/%d/%d" if stride == 3 else " %d//%d"
+    loop_ends = np.cumsum(loop_totals)
+
+    for i in range(0, len(loop_totals), OBJ_WRITE_CHUNK):
+        totals = loop_totals[i:i + OBJ_WRITE_CHUNK].tolist()
+        loop_start = loop_ends[i - 1] if i else 0
+        loop_end = loop_ends[min(i + OBJ_WRITE_CHUNK, len(loop_totals)) - 1]
+
+        parts = []
+        for total in totals:
+            template = face_templates.get(total)
+            if template is None:
+                template = face_templates[total] = "f" + token * total + "\n"
+            parts.append(template)
+        fh.write("".join(parts) % tuple(loop_indices[loop_start:loop_end].ravel().tolist()))
+
+def write_obj_payload(fh, payload, offsets, state):
+    fh.write(f"o {payload['name']}\n")
+    write_obj_rows(fh, "v", payload["positions"], "%.6f %.6f %.6f")
+    if payload["uvs"] is not None:
+        write_obj_rows(fh, "vt", payload["uvs"], "%.6f %.6f")
+    write_obj_rows(fh, "vn", payload["normals"], "%.4f %.4f %.4f")
+
+    columns = [payload["loop_verts"] + offsets[0] + 1]
+    if payload["uvs"] is not None:
+        columns.append(payload["loop_uvs"] + offsets[1] + 1)
+    columns.append(payload["loop_normals"] + offsets[2] + 1)
+    loop_indices = np.stack(columns, axis=1)
+
+    face_mat_indices = payload["face_mat_indices"]
+    loop_totals = payload["loop_totals"]
+    loop_offsets = np.concatenate(([0], np.cumsum(loop_totals)))
+    run_starts = np.concatenate(([0], np.flatnonzero(np.diff(face_mat_indices)) + 1, [len(loop_totals)]))
+
+    for run_start, run_end in zip(run_starts[:-1], run_starts[1:]):
+        mat_name = payload["material_names"][face_mat_indices[run_start]]
+        if mat_name != state.get("material"):
+            fh.write(f"usemtl {mat_name}\n" if mat_name else "usemtl\n")
+            state["material"] = mat_name
+        write_obj_faces(
+            fh,
+            loop_indices[loop_offsets[run_start]:loop_offsets[run_end]],
+            loop_totals[run_start:run_end],
+        )
+
+    offsets[0] += len(payload["positions"])
+    offsets[1] += len(payload["uvs"]) if payload["uvs"] is not None else 0
+    offsets[2] += len(payload["normals"])
+
+def get_material_texture_path(mat, base_dir):
+    image_datablock = get_base_color_texture_from_material(mat)
+    if not (image_datablock and image_datablock.filepath):
+        return None
+    tex_path = bpy.path.abspath(image_datablock.filepath, library=image_datablock.library)
+    try:
+        return os.path.relpath(tex_path, base_dir)
+    except ValueError:
+        return tex_path
+
+def get_mtl_entries(material_names, base_dir):
+    entries = []
+    for mat_name in material_names:
+        mat = bpy.data.materials.get(mat_name)
+        entries.append((mat_name, get_material_texture_path(mat, base_dir) if mat else None))
+    return entries
+
+def write_mtl_file(mtl_path, mtl_entries):
+    with open(mtl_path, "w", encoding="utf-8") as fh:
+        for mat_name, tex_path in mtl_entries:
+            fh.write(f"newmtl {mat_name}\nKa 1.000000 1.000000 1.000000\nKd 1.000000 1.000000 1.000000\nKs 0.000000 0.000000 0.000000\nd 1.000000\nillum 1\n")
+            if tex_path:
+                fh.write(f"map_Kd {tex_path}\n")
+            fh.write("\n")
+
+def get_export_sort_key(obj):
+    for slot in obj.material_slots:
+        if slot.material:
+            return (slot.material.name, obj.name)
+    return ("", obj.name)
+
+def iter_obj_payloads(objects):
+    # Reads one object's arrays at a time, so the writer only ever holds the object it is writing.
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    for obj in sorted(objects, key=get_export_sort_key):
+        if obj.type != 'MESH':
+            continue
+        payload = get_object_export_arrays(obj, depsgraph)
+        if payload is not None:
+            yield payload
+
+def get_payload_material_names(payloads):
+    material_names = []
+    for payload in payloads:
+        for mat_name in payload["material_names"]:
+            if mat_name and mat_name not in material_names:
+                material_names.append(mat_name)
+    return material_names
+
+def write_obj_file(filepath, payloads, compress=False):
+    # Streams the payloads into the .obj one by one and returns the stats with the material names
+    # in first-use order. No bpy access, so part files can be written on a worker thread as long
+    # as payloads is an already read list.
+    start = time.perf_counter()
+    mtl_path = os.path.splitext(filepath)[0] + ".mtl"
+    obj_path = filepath + ".gz" if compress else filepath
+    offsets = [0, 0, 0]
+    state = {}
+    material_names = []
+    face_count = 0
+
+    if compress:
+        fh = gzip.open(obj_path, "wt", encoding="utf-8", compresslevel=6)
+    else:
+        fh = open(obj_path, "w", encoding="utf-8", buffering=1 << 20)
+    with fh:
+        fh.write(f"# Model Repair Tool\nmtllib {os.path.basename(mtl_path)}\n")
+        for payload in payloads:
+            write_obj_payload(fh, payload, offsets, state)
+            face_count += len(payload["loop_totals"])
+            for mat_name in payload["material_names"]:
+                if mat_name and mat_name not in material_names:
+                    material_names.append(mat_name)
+
+    return {
+        "path": obj_path,
+        "mtl_path": mtl_path,
+        "vertices": offsets[0],
+        "faces": face_count,
+        "materials": len(material_names),
+        "material_names": material_names,
+        "bytes": os.path.getsize(obj_path),
+        "seconds": time.perf_counter() - start,
+    }
+
+def write_obj_part(filepath, payloads, mtl_entries, compress=False):
+    stats = write_obj_file(filepath, payloads, compress)
+    write_mtl_file(stats["mtl_path"], mtl_entries)
+    return stats
+
+def export_obj_model(filepath, objects, compress=False):
+    start = time.perf_counter()
+    stats = write_obj_file(filepath, iter_obj_payloads(objects), compress)
+    write_mtl_file(stats["mtl_path"], get_mtl_entries(stats["material_names"], os.path.dirname(filepath)))
+    stats["seconds"] = time.perf_counter() - start
+    return stats
+
+def get_part_path(base_dir, stem, used_paths):
+    # A part whose path is already taken (by the combined file or by another part) gets a
+    # numbered name, so no two workers write the same .obj/.mtl.
+    part_stem = bpy.path.clean_name(stem)
+    part_path = os.path.join(base_dir, f"{part_stem}.obj")
+    suffix = 1
+    while os.path.normcase(os.path.abspath(part_path)) in used_paths:
+        suffix += 1
+        part_path = os.path.join(base_dir, f"{part_stem}_{suffix}.obj")
+    used_paths.add(os.path.normcase(os.path.abspath(part_path)))
+    return part_path
+
+def export_obj_split(filepath, object_groups, compress=False):
+    # object_groups maps a file stem (the final material name) to its objects. Each part is
+    # written next to filepath as <stem>.obj besides the combined file. Every object is read once
+    # on the main thread and streamed into the combined file; the objects of one part are kept
+    # until the part is complete and then handed to the thread pool, which formats, compresses
+    # and writes it. At most one part per worker is queued, so memory stays bounded by a few
+    # parts instead of the whole model.
+    start = time.perf_counter()
+    base_dir = os.path.dirname(filepath)
+    used_paths = {os.path.normcase(os.path.abspath(filepath))}
+    max_workers = max(1, min(len(object_groups), os.cpu_count() or 1))
+    futures = []
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        def iter_split_payloads():
+            for stem in sorted(object_groups):
+                part_payloads = []
+                for payload in iter_obj_payloads(object_groups[stem]):
+                    part_payloads.append(payload)
+                    yield payload
+                if not part_payloads:
+                    continue
+                pending = [future for future in futures if not future.done()]
+                if len(pending) >= max_workers:
+                    pending[0].result()
+                futures.append(pool.submit(
+                    write_obj_part,
+                    get_part_path(base_dir, stem, used_paths),
+                    part_payloads,
+                    get_mtl_entries(get_payload_material_names(part_payloads), base_dir),
+                    compress,
+                ))
+
+        stats = write_obj_file(filepath, iter_split_payloads(), compress)
+        write_mtl_file(stats["mtl_path"], get_mtl_entries(stats["material_names"], base_dir))
+        parts = [future.result() for future in futures]
+
+    stats["parts"] = parts
+    stats["seconds"] = time.perf_counter() - start
+    return stats
+
+def get_export_groups(work_collection_name):
+    index = get_scene_index(work_collection_name)
+    object_groups = {}
+    for obj in index["objects"]:
+        group = index["groups"][obj.as_pointer()]
+        stem = WTT_OT_AnalyzeMaterial.get_final_mat_name(group.name) if group else work_collection_name
+        object_groups.setdefault(stem, []).append(obj)
+    return object_groups
+
+def get_export_message(stats):
+    message = f"Exported {stats['faces']} faces in {stats['materials']} materials to '{os.path.basename(stats['path'])}' ({stats['bytes'] / 1048576:.1f} MB, {stats['seconds']:.2f} s)"
+    if "parts" in stats:
+        message += f" and {len(stats['parts'])} per-material files ({sum(part['bytes'] for part in stats['parts']) / 1048576:.1f} MB)"
+    return message
+
+EXPORT_EXTENSIONS = {".obj", ".glb"}
+
+def get_export_base_path(filepath):
+    # Strips every trailing .obj/.glb, so "model.glb.obj" and "model.glb" both give "model".
+    root, ext = os.path.splitext(filepath)
+    while ext.lower() in EXPORT_EXTENSIONS:
+        filepath = root
+        root, ext = os.path.splitext(filepath)
+    return filepath
+
+def check_export_extension(operator):
+    # ExportHelper only knows one filename_ext, so the file browser path follows the chosen format.
+    if not os.path.basename(operator.filepath):
+        return False
+    filepath = get_export_base_path(operator.filepath) + (".glb" if operator.file_format == 'GLB' else ".obj")
+    if filepath == operator.filepath:
+        return False
+    operator.filepath = filepath
+    return True
+
+GLB_MAGIC = 0x46546C67
+GLB_CHUNK_JSON = 0x4E4F534A
+GLB_CHUNK_BIN = 0x004E4942
+GLTF_FLOAT = 5126
+GLTF_UNSIGNED_INT = 5125
+GLTF_ARRAY_BUFFER = 34962
+GLTF_ELEMENT_ARRAY_BUFFER = 34963
+GLB_IMAGE_MIME_TYPES = {".png": "image/png", ".jpg": "image/jpeg", ".jpeg": "image/jpeg"}
+
+def get_object_glb_arrays(obj, depsgraph):
+    eval_obj = obj.evaluated_get(depsgraph)
+    mesh = eval_obj.to_mesh()
+    try:
+        return get_mesh_glb_arrays(obj, mesh)
+    finally:
+        eval_obj.to_mesh_clear()
+
+def get_mesh_glb_arrays(obj, mesh):
+    # Per-loop position / normal / UV rows (Y-up, world space) and the loop triangles.
+    tri_count = len(mesh.loop_triangles)
+    if not tri_count:
+        return None
+
+    matrix = np.array(obj.matrix_world, dtype=np.float64)
+    rotation = OBJ_AXIS_MATRIX @ matrix[:3, :3]
+    normal_matrix = OBJ_AXIS_MATRIX @ np.linalg.inv(matrix[:3, :3]).T
+
+    positions = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", positions)
+    positions = positions.reshape(-1, 3) @ rotation.T + OBJ_AXIS_MATRIX @ matrix[:3, 3]
+
+    loop_count = len(mesh.loops)
+    loop_verts = np.empty(loop_count, dtype=np.int32)
+    mesh.loops.foreach_get("vertex_index", loop_verts)
+
+    normals = np.empty(loop_count * 3, dtype=np.float32)
+    mesh.corner_normals.foreach_get("vector", normals)
+    normals = normals.reshape(-1, 3) @ normal_matrix.T
+    lengths = np.linalg.norm(normals, axis=1)
+    normals /= np.where(lengths > 0.0, lengths, 1.0)[:, None]
+
+    uvs = np.zeros(loop_count * 2, dtype=np.float32)
+    if mesh.uv_layers.active:
+        mesh.uv_layers.active.data.foreach_get("uv", uvs)
+    uvs = uvs.reshape(-1, 2)
+    uvs[:, 1] = 1.0 - uvs[:, 1]
+
+    tri_loops = np.empty(tri_count * 3, dtype=np.int32)
+    mesh.loop_triangles.foreach_get("loops", tri_loops)
+    tri_loops = tri_loops.reshape(-1, 3)
+    if np.linalg.det(matrix[:3, :3]) < 0.0:
+        tri_loops = tri_loops[:, ::-1]
+    tri_mat_indices = np.empty(tri_count, dtype=np.int32)
+    mesh.loop_triangles.foreach_get("material_index", tri_mat_indices)
+
+    material_names = [slot.material.name if slot.material else None for slot in obj.material_slots] or [None]
+    return {
+        "loop_rows": np.hstack((positions[loop_verts], normals, uvs)).astype(np.float32),
+        "tri_loops": tri_loops,
+        "tri_mat_indices": np.clip(tri_mat_indices, 0, len(material_names) - 1),
+        "material_names": material_names,
+    }
+
+def add_glb_buffer_view(gltf, bin_parts, data, target=None, byte_stride=None):
+    offset = sum(len(part) for part in bin_parts)
+    bin_parts.append(data + b"\0" * (-len(data) % 4))
+    view = {"buffer": 0, "byteOffset": offset, "byteLength": len(data)}
+    if target:
+        view["target"] = target
+    if byte_stride:
+        view["byteStride"] = byte_stride
+    gltf["bufferViews"].append(view)
+    return len(gltf["bufferViews"]) - 1
+
+def add_glb_image(gltf, bin_parts, image_datablock, base_dir, embed_textures):
+    tex_path = bpy.path.abspath(image_datablock.filepath, library=image_datablock.library)
+    mime_type = GLB_IMAGE_MIME_TYPES.get(os.path.splitext(tex_path)[1].lower())
+    data = None
+    if embed_textures and mime_type:
+        if image_datablock.packed_file:
+            data = image_datablock.packed_file.data
+        elif os.path.isfile(tex_path):
+            with open(tex_path, "rb") as f:
+                data = f.read()
+
+    if data:
+        image = {"bufferView": add_glb_buffer_view(gltf, bin_parts, data), "mimeType": mime_type}
+    else:
+        try:
+            uri = os.path.relpath(tex_path, base_dir)
+        except ValueError:
+            uri = tex_path
+        image = {"uri": quote(uri.replace(os.sep, "/"))}
+    image["name"] = image_datablock.name
+    gltf["images"].append(image)
+    gltf["textures"].append({"source": len(gltf["images"]) - 1})
+    return len(gltf["textures"]) - 1
+
+def export_glb_model(filepath, objects, embed_textures=False):
+    # One node/mesh per material: every object's triangles of that material are merged in world
+    # space, identical vertices are welded and the rows go into one interleaved buffer view.
+    start = time.perf_counter()
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    material_parts = {}
+    for obj in sorted(objects, key=get_export_sort_key):
+        if obj.type != 'MESH':
+            continue
+        arrays = get_object_glb_arrays(obj, depsgraph)
+        if arrays is None:
+            continue
+        for mat_index in np.unique(arrays["tri_mat_indices"]):
+            tris = arrays["tri_loops"][arrays["tri_mat_indices"] == mat_index]
+            used_loops, local_indices = np.unique(tris, return_inverse=True)
+            part = material_parts.setdefault(arrays["material_names"][mat_index], {"rows": [], "indices": [], "count": 0})
+            part["rows"].append(arrays["loop_rows"][used_loops])
+            part["indices"].append(local_indices.reshape(-1) + part["count"])
+            part["count"] += len(used_loops)
+
+    gltf = {
+        "asset": {"version": "2.0", "generator": "Model Repair Tool"},
+        "scene": 0,
+        "scenes": [{"nodes": []}],
+        "nodes": [],
+        "meshes": [],
+        "materials": [],
+        "textures": [],
+        "images": [],
+        "accessors": [],
+        "bufferViews": [],
+        "buffers": [],
+    }
+    bin_parts = []
+    texture_indices = {}
+    base_dir = os.path.dirname(filepath)
+    vertex_count = 0
+    face_count = 0
+
+    for mat_name, part in material_parts.items():
+        rows, welded = np.unique(np.concatenate(part["rows"]), axis=0, return_inverse=True)
+        indices = welded.reshape(-1)[np.concatenate(part["indices"])].astype(np.uint32)
+        rows = np.ascontiguousarray(rows, dtype=np.float32)
+        vertex_count += len(rows)
+        face_count += len(indices) // 3
+
+        vertex_view = add_glb_buffer_view(gltf, bin_parts, rows.tobytes(), GLTF_ARRAY_BUFFER, 32)
+        index_view = add_glb_buffer_view(gltf, bin_parts, indices.tobytes(), GLTF_ELEMENT_ARRAY_BUFFER)
+        first_accessor = len(gltf["accessors"])
+        gltf["accessors"].extend([
+            {"bufferView": vertex_view, "byteOffset": 0, "componentType": GLTF_FLOAT, "count": len(rows), "type": "VEC3",
+             "min": rows[:, 0:3].min(axis=0).tolist(), "max": rows[:, 0:3].max(axis=0).tolist()},
+            {"bufferView": vertex_view, "byteOffset": 12, "componentType": GLTF_FLOAT, "count": len(rows), "type": "VEC3"},
+            {"bufferView": vertex_view, "byteOffset": 24, "componentType": GLTF_FLOAT, "count": len(rows), "type": "VEC2"},
+            {"bufferView": index_view, "componentType": GLTF_UNSIGNED_INT, "count": len(indices), "type": "SCALAR"},
+        ])
+
+        material = {"name": mat_name or "Default", "pbrMetallicRoughness": {"metallicFactor": 0.0, "roughnessFactor": 1.0}}
+        mat = bpy.data.materials.get(mat_name) if mat_name else None
+        image_datablock = get_base_color_texture_from_material(mat) if mat else None
+        if image_datablock and image_datablock.filepath:
+            image_ptr = image_datablock.as_pointer()
+            if image_ptr not in texture_indices:
+                texture_indices[image_ptr] = add_glb_image(gltf, bin_parts, image_datablock, base_dir, embed_textures)
+            material["pbrMetallicRoughness"]["baseColorTexture"] = {"index": texture_indices[image_ptr]}
+        gltf["materials"].append(material)
+
+        gltf["meshes"].append({
+            "name": material["name"],
+            "primitives": [{
+                "attributes": {"POSITION": first_accessor, "NORMAL": first_accessor + 1, "TEXCOORD_0": first_accessor + 2},
+                "indices": first_accessor + 3,
+                "material": len(gltf["materials"]) - 1,
+                "mode": 4,
+            }],
+        })
+        gltf["nodes"].append({"name": material["name"], "mesh": len(gltf["meshes"]) - 1})
+        gltf["scenes"][0]["nodes"].append(len(gltf["nodes"]) - 1)
+
+    # glTF arrays may not be empty, so a model without triangles is written without a buffer
+    # (and without the BIN chunk) and only keeps its empty scene.
+    bin_chunk = b"".join(bin_parts)
+    if bin_chunk:
+        gltf["buffers"].append({"byteLength": len(bin_chunk)})
+    if not gltf["scenes"][0]["nodes"]:
+        del gltf["scenes"][0]["nodes"]
+    for key in [key for key, value in gltf.items() if value == []]:
+        del gltf[key]
+    json_chunk = json.dumps(gltf, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    json_chunk += b" " * (-len(json_chunk) % 4)
+
+    with open(filepath, "wb") as fh:
+        fh.write(struct.pack("<III", GLB_MAGIC, 2, 12 + 8 + len(json_chunk) + (8 + len(bin_chunk) if bin_chunk else 0)))
+        fh.write(struct.pack("<II", len(json_chunk), GLB_CHUNK_JSON))
+        fh.write(json_chunk)
+        if bin_chunk:
+            fh.write(struct.pack("<II", len(bin_chunk), GLB_CHUNK_BIN))
+            fh.write(bin_chunk)
+
+    return {
+        "path": filepath,
+        "vertices": vertex_count,
+        "faces": face_count,
+        "materials": len(material_parts),
+        "bytes": os.path.getsize(filepath),
+        "seconds": time.perf_counter() - start,
+    }
+
+class WTT_OT_ExportModel(Operator, ExportHelper):
     bl_idname = "wtt.export_model"
     bl_label = "Export .obj"
-    bl_description = "Export all models in 'Ground_Work' as .obj (Please check 'Selection Only' manually)"
+    bl_description = "Export all models in 'Ground_Work' as .obj with a matching .mtl"
+
+    filename_ext = ".obj"
+    filter_glob: StringProperty(default="*.obj;*.glb", options={'HIDDEN'})
+    file_format: EnumProperty(
+        name="Format",
+        description="File format to write (.glb is written next to the chosen path)",
+        items=[
+            ('OBJ', "OBJ", "Text .obj with a matching .mtl"),
+            ('GLB', "glTF Binary", "Binary .glb with one mesh per material"),
+            ('BOTH', "Both", "Write the .obj and the .glb"),
+        ],
+        default='OBJ'
+    )
+    embed_textures: BoolProperty(
+        name="Embed Textures (.glb)",
+        description="Pack PNG/JPEG textures into the .glb instead of referencing them",
+        default=False
+    )
+    split_by_material: BoolProperty(
+        name="Split by Material",
+        description="Also write one .obj/.mtl per final material (Body.obj, Turret.obj...) next to the combined file",
+        default=False
+    )
+    compress: BoolProperty(
+        name="Gzip",
+        description="Write the .obj files gzip-compressed (.obj.gz)",
+        default=False
+    )
+
+    def check(self, context):
+        return check_export_extension(self)
 
     def execute(self, context):
         work_collection = bpy.data.collections.get("Ground_Work")
@@ -730,8 +2450,7 @@ class WTT_OT_ExportModel(Operator):
 
         if bpy.context.object and bpy.context.object.mode != 'OBJECT':
             bpy.ops.object.mode_set(mode='OBJECT')
-        
-        bpy.ops.object.select_all(action='DESELECT')
+            profile_count("ops_calls")
 
         objects_to_export = get_all_ground_objects(context, include_hidden=False)
         
@@ -739,14 +2458,19 @@ class WTT_OT_ExportModel(Operator):
             self.report({'WARNING'}, "No exportable objects in 'Ground_Work' group.")
             return {'CANCELLED'}
 
-        for obj in objects_to_export:
-            obj.select_set(True)
-        
-        if objects_to_export:
-            context.view_layer.objects.active = objects_to_export[0]
-
-        bpy.ops.wm.obj_export('INVOKE_DEFAULT')
-        
+        base_path = get_export_base_path(self.filepath)
+        messages = []
+        if self.file_format in {'OBJ', 'BOTH'}:
+            if self.split_by_material:
+                stats = export_obj_split(base_path + ".obj", get_export_groups("Ground_Work"), self.compress)
+            else:
+                stats = export_obj_model(base_path + ".obj", objects_to_export, self.compress)
+            messages.append(get_export_message(stats))
+        if self.file_format in {'GLB', 'BOTH'}:
+            stats = export_glb_model(base_path + ".glb", objects_to_export, self.embed_textures)
+            messages.append(get_export_message(stats))
+        profile_count("objects_touched", len(objects_to_export))
+        self.report({'INFO'}, "; ".join(messages) + ".")
         return {'FINISHED'}
 
 class OBJECT_OT_main_menu(Operator):
@@ -785,17 +2509,89 @@ class OBJECT_OT_ground_vehicle(Operator):
         context.scene.show_secondary_panel = False 
         return {'FINISHED'}
 
+def get_process_memory_bytes():
+    if sys.platform.startswith("linux"):
+        try:
+            with open("/proc/self/statm") as f:
+                return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except (OSError, ValueError, IndexError):
+            return None
+    if sys.platform == "win32":
+        import ctypes
+        from ctypes import wintypes
+
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [
+                ("cb", wintypes.DWORD),
+                ("PageFaultCount", wintypes.DWORD),
+                ("PeakWorkingSetSize", ctypes.c_size_t),
+                ("WorkingSetSize", ctypes.c_size_t),
+                ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                ("PagefileUsage", ctypes.c_size_t),
+                ("PeakPagefileUsage", ctypes.c_size_t),
+            ]
+
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        try:
+            get_process = ctypes.windll.kernel32.GetCurrentProcess
+            get_process.restype = wintypes.HANDLE
+            if ctypes.windll.psapi.GetProcessMemoryInfo(get_process(), ctypes.byref(counters), counters.cb):
+                return counters.WorkingSetSize
+        except (AttributeError, OSError):
+            pass
+    return None
+
+def format_memory(num_bytes):
+    return "n/a" if num_bytes is None else f"{num_bytes / 1048576:.0f} MB"
+
+def full_reset_scene(context):
+    # Drops every object and collection of the scene in one batch, frees the image pixel
+    # buffers and purges the datablocks left without users (meshes, materials, images...).
+    for image in bpy.data.images:
+        if image.has_data:
+            image.buffers_free()
+
+    ids = list(context.scene.objects) + list(bpy.data.collections)
+    if ids:
+        bpy.data.batch_remove(ids)
+    purged = bpy.data.orphans_purge(do_local_ids=True, do_linked_ids=True, do_recursive=True)
+    _material_fingerprints.clear()
+    invalidate_texture_cache()
+    return len(ids) + purged
+
 class OBJECT_OT_clear_scene(Operator):
     bl_idname = "object.clear_scene"
     bl_label = "Clear Scene (Air)"
     bl_description = "Warning! This will clear all items in the scene and create a new collection"
+
+    full_reset: BoolProperty(
+        name="Full Reset",
+        description="Also delete all objects, purge unused meshes, materials and images and free image memory",
+        default=False,
+        options={'SKIP_SAVE'}
+    )
+
     def execute(self, context):
-        for coll in bpy.data.collections:
-            bpy.data.collections.remove(coll)
+        memory_before = get_process_memory_bytes()
+        removed = 0
+        if self.full_reset:
+            removed = full_reset_scene(context)
+        else:
+            for coll in bpy.data.collections:
+                bpy.data.collections.remove(coll)
+            invalidate_scene_index()
+        set_source_model(context.scene, "")
         
         if "Aviation_Work" not in bpy.data.collections:
             geo_collection = bpy.data.collections.new("Aviation_Work")
             bpy.context.scene.collection.children.link(geo_collection)
+
+        if self.full_reset:
+            self.report({'INFO'}, f"Removed {removed} datablocks, memory {format_memory(memory_before)} -> {format_memory(get_process_memory_bytes())}.")
         return {'FINISHED'}
 
 class OBJECT_OT_clean_low_res(Operator):
@@ -803,47 +2599,49 @@ class OBJECT_OT_clean_low_res(Operator):
     bl_label = "Clean Misc (Air)"
     bl_description = "This keeps objects with the same texture as the active object and deletes all others.\nPlease select one object in Object Mode as a reference."
 
+    auto: BoolProperty(
+        name="Auto Body",
+        description="Use the texture picked by Auto Body instead of the active object",
+        default=False,
+        options={'SKIP_SAVE'}
+    )
+
     @classmethod
     def poll(cls, context):
         if not context.scene:
             return False
-        ob = context.active_object
-        return ob and ob.type == 'MESH' and "Aviation_Work" in bpy.data.collections
+        return "Aviation_Work" in bpy.data.collections
 
     def execute(self, context):
+        index = get_scene_index("Aviation_Work")
         ob = context.active_object
-        if not ob:
+        if self.auto:
+            refresh_rules(self.report)
+            proposal = propose_air_body(index)
+            ob = proposal["object"] if proposal else None
+        if not ob or ob.type != 'MESH':
             self.report({'ERROR'}, "Please select an object in Object Mode first")
             return {'CANCELLED'}
 
-        def get_object_image(obj):
-            if obj.data.materials:
-                for mat in obj.data.materials:
-                    if mat and mat.use_nodes:
-                        for node in mat.node_tree.nodes:
-                            if node.type == 'TEX_IMAGE' and node.image:
-                                return node.image
-            return None
-
-        target_image = get_object_image(obj)
+        target_image = get_base_color_texture_from_obj(ob)
         if not target_image:
             self.report({'ERROR'}, "Selected object has no associated texture. Operation cancelled.")
             return {'CANCELLED'}
 
-        objects_to_keep = set()
-        for obj in bpy.data.collections["Aviation_Work"].objects:
-            if obj.type == 'MESH' and get_object_image(obj) == target_image:
-                objects_to_keep.add(obj)
+        objects_to_keep = {
+            obj.as_pointer() for obj in index["key_objects"].get(get_texture_filename_key(target_image), [])
+            if index["groups"][obj.as_pointer()] is None and index["images"][obj.as_pointer()] == target_image
+        }
 
         total_objects = len(bpy.data.collections["Aviation_Work"].objects)
-        objects_to_remove = [obj for obj in bpy.data.collections["Aviation_Work"].objects if obj not in objects_to_keep]
+        objects_to_remove = [obj for obj in bpy.data.collections["Aviation_Work"].objects if obj.as_pointer() not in objects_to_keep]
 
         if len(objects_to_keep) == 0 or (total_objects - len(objects_to_keep)) == total_objects:
             self.report({'ERROR'}, "This operation would remove all objects. Operation cancelled.")
             return {'CANCELLED'}
 
-        for obj in objects_to_remove:
-            bpy.data.objects.remove(obj)
+        bpy.data.batch_remove(objects_to_remove)
+        invalidate_scene_index()
 
         self.report({'INFO'}, f"Kept {len(objects_to_keep)} objects, removed {len(objects_to_remove)} objects")
         return {'FINISHED'}
@@ -894,10 +2692,24 @@ class OBJECT_OT_ground_clear_scene(Operator):
     bl_idname = "object.ground_clear_scene"
     bl_label = "Clear Scene"
     bl_description = "Warning! This will clear all items in the scene and create a new 'Ground_Work' collection"
+
+    full_reset: BoolProperty(
+        name="Full Reset",
+        description="Also delete all objects, purge unused meshes, materials and images and free image memory",
+        default=False,
+        options={'SKIP_SAVE'}
+    )
+
     def execute(self, context):
-        
-        for coll in bpy.data.collections:
-            bpy.data.collections.remove(coll)
+        memory_before = get_process_memory_bytes()
+        removed = 0
+        if self.full_reset:
+            removed = full_reset_scene(context)
+        else:
+            for coll in bpy.data.collections:
+                bpy.data.collections.remove(coll)
+            invalidate_scene_index()
+        set_source_model(context.scene, "")
 
         if "Ground_Work" not in bpy.data.collections:
             geo_collection = bpy.data.collections.new("Ground_Work")
@@ -906,7 +2718,10 @@ class OBJECT_OT_ground_clear_scene(Operator):
         cleanup_scene_props(context.scene)
         cleanup_material_list(context.scene)
         
-        self.report({'INFO'}, "Scene cleared, 'Ground_Work' created.")
+        if self.full_reset:
+            self.report({'INFO'}, f"Scene reset, 'Ground_Work' created. Removed {removed} datablocks, memory {format_memory(memory_before)} -> {format_memory(get_process_memory_bytes())}.")
+        else:
+            self.report({'INFO'}, "Scene cleared, 'Ground_Work' created.")
         return {'FINISHED'}
 
 class OBJECT_OT_shift_uv(Operator):
@@ -928,22 +2743,75 @@ class OBJECT_OT_shift_uv(Operator):
             self.report({'INFO'}, "No objects to process in the work collection.")
             return {'FINISHED'}
             
+        timings = []
+        processed_meshes = set()
+        start_total = time.perf_counter()
+
         for obj in objects_to_process:
-            if obj.type == 'MESH' and obj.data.uv_layers:
+            if obj.type == 'MESH' and obj.data.uv_layers and obj.data.as_pointer() not in processed_meshes:
+                processed_meshes.add(obj.data.as_pointer())
                 active_uv_layer = obj.data.uv_layers.active
                 if active_uv_layer: 
-                    for loop in obj.data.loops:
-                        uv_coord = active_uv_layer.data[loop.index].uv
-                        uv_coord.x -= math.floor(uv_coord.x)
-                        uv_coord.y -= math.floor(uv_coord.y)
-        
-        self.report({'INFO'}, f"Processed UVs for {len(objects_to_process)} objects.")
+                    start = time.perf_counter()
+                    uv_data = active_uv_layer.data
+                    uvs = np.empty(len(uv_data) * 2, dtype=np.float32)
+                    uv_data.foreach_get("uv", uvs)
+                    uvs -= np.floor(uvs)
+                    uv_data.foreach_set("uv", uvs)
+                    obj.data.update_tag()
+                    seconds = time.perf_counter() - start
+                    timings.append((seconds, obj.name, len(uv_data)))
+                    profile_record("shift_uv_objects", {"object": obj.name, "loops": len(uv_data), "ms": round(seconds * 1000, 3)})
+
+        total_time = time.perf_counter() - start_total
+        profile_count("objects_touched", len(timings))
+
+        if timings:
+            seconds, obj_name, loop_count = max(timings)
+            self.report({'INFO'}, f"Processed UVs for {len(timings)} objects in {total_time * 1000:.1f} ms (slowest: '{obj_name}', {loop_count} loops, {seconds * 1000:.1f} ms; per-object times in the profile export).")
+        else:
+            self.report({'INFO'}, "No objects with UVs to process.")
         return {'FINISHED'}
 
+def get_uv_margin_face_mask(mesh, uv_margin):
+    face_count = len(mesh.polygons)
+    uv_data = mesh.uv_layers.active.data
+    if not face_count or not len(uv_data):
+        return np.zeros(face_count, dtype=bool)
+
+    uvs = np.empty(len(uv_data) * 2, dtype=np.float32)
+    uv_data.foreach_get("uv", uvs)
+    uvs = uvs.astype(np.float64)
+    fract = uvs - np.floor(uvs)
+    bad_loops = ((fract < uv_margin) | (fract > (1.0 - uv_margin))).reshape(-1, 2).any(axis=1)
+
+    loop_starts = np.empty(face_count, dtype=np.int32)
+    mesh.polygons.foreach_get("loop_start", loop_starts)
+    return np.logical_or.reduceat(bad_loops, loop_starts)
+
+def delete_faces_by_mask(mesh, face_mask):
+    bm = bmesh.new()
+    bm.from_mesh(mesh)
+    bm.faces.ensure_lookup_table()
+    faces_to_remove = [bm.faces[i] for i in np.flatnonzero(face_mask)]
+    bmesh.ops.delete(bm, geom=faces_to_remove, context='FACES')
+    profile_count("faces_deleted", len(faces_to_remove))
+    bm.to_mesh(mesh)
+    bm.free()
+    mesh.update()
+
 class OBJECT_OT_delete_invalid_uv(Operator):
     bl_idname = "object.delete_invalid_uv"
     bl_label = "Delete Small Islands"
     bl_description = "Delete small fragments that might affect the UV" 
+
+    dry_run: BoolProperty(
+        name="Dry Run",
+        description="Only count the faces that would be deleted",
+        default=False,
+        options={'SKIP_SAVE'}
+    )
+
     def execute(self, context):
         
         objects_to_process = []
@@ -960,68 +2828,49 @@ class OBJECT_OT_delete_invalid_uv(Operator):
             return {'FINISHED'}
 
         processed_objects = 0
+        affected_objects = 0
         removed_faces_total = 0
+        processed_meshes = set()
+        uv_margin = 1 / 2048 
         
         active_obj = context.view_layer.objects.active
-        active_obj_name = active_obj.name if active_obj else None
         original_mode = 'OBJECT'
         if active_obj and active_obj.mode != 'OBJECT':
             original_mode = active_obj.mode
             bpy.ops.object.mode_set(mode='OBJECT')
+            profile_count("ops_calls")
 
         for obj in objects_to_process:
-            if obj.type == 'MESH' and obj.data.uv_layers:
-                bpy.context.view_layer.objects.active = obj
-                bpy.ops.object.mode_set(mode='EDIT')
-                
-                bm = bmesh.from_edit_mesh(obj.data)
-                uv_layer = bm.loops.layers.uv.active
-                if not uv_layer:
-                    bpy.ops.object.mode_set(mode='OBJECT')
-                    continue
-
-                faces_to_remove = []
-                uv_margin = 1 / 2048 
-                
-                for face in bm.faces:
-                    remove_this_face = False
-                    for loop in face.loops:
-                        uv_coord = loop[uv_layer].uv
-                        
-                        fract_x = uv_coord.x - math.floor(uv_coord.x)
-                        fract_y = uv_coord.y - math.floor(uv_coord.y)
-                        
-                        if fract_x < uv_margin or \
-                            fract_x > (1.0 - uv_margin) or \
-                            fract_y < uv_margin or \
-                            fract_y > (1.0 - uv_margin):
-                            remove_this_face = True
-                            break 
-                    if remove_this_face:
-                        faces_to_remove.append(face)
-                
-                if faces_to_remove:
-                    bmesh.ops.delete(bm, geom=faces_to_remove, context='FACES')
-                    removed_faces_total += len(faces_to_remove)
-                    bmesh.update_edit_mesh(obj.data)
-                
-                bpy.ops.object.mode_set(mode='OBJECT')
-                processed_objects +=1
-        
-        if active_obj_name:
-            active_obj_to_restore = bpy.data.objects.get(active_obj_name)
-            if active_obj_to_restore:
-                bpy.context.view_layer.objects.active = active_obj_to_restore
-                if active_obj_to_restore.mode != original_mode:
-                    try:
-                        bpy.ops.object.mode_set(mode=original_mode)
-                    except RuntimeError:
-                        pass 
-        
-        if processed_objects > 0:
-                self.report({'INFO'}, f"Processed {processed_objects} objects, removed {removed_faces_total} small faces.")
-        else:
+            if obj.type != 'MESH' or not obj.data.uv_layers or not obj.data.uv_layers.active:
+                continue
+            mesh = obj.data
+            if mesh.as_pointer() in processed_meshes:
+                continue
+            processed_meshes.add(mesh.as_pointer())
+
+            face_mask = get_uv_margin_face_mask(mesh, uv_margin)
+            face_count = int(np.count_nonzero(face_mask))
+            if face_count:
+                if not self.dry_run:
+                    delete_faces_by_mask(mesh, face_mask)
+                removed_faces_total += face_count
+                affected_objects += 1
+            processed_objects += 1
+        
+        profile_count("objects_touched", processed_objects)
+        if active_obj and original_mode != 'OBJECT':
+            try:
+                bpy.ops.object.mode_set(mode=original_mode)
+                profile_count("ops_calls")
+            except RuntimeError:
+                pass 
+        
+        if processed_objects == 0:
             self.report({'INFO'}, "No objects to process or objects have no valid UVs.")
+        elif self.dry_run:
+            self.report({'INFO'}, f"Dry run: {removed_faces_total} small faces on {affected_objects} of {processed_objects} objects would be removed.")
+        else:
+            self.report({'INFO'}, f"Processed {processed_objects} objects, removed {removed_faces_total} small faces.")
             
         return {'FINISHED'}
 
@@ -1091,76 +2940,338 @@ class WTT_OT_ExecuteAssignMaterial(Operator):
             return {'CANCELLED'}
         
         collections_to_process = [coll for coll in work_collection.children]
+        invalidate_texture_cache()
+        index = get_scene_index(work_collection.name)
         
         materials_assigned_count = 0
+        skipped_count = 0
         mats_in_use = set()
+        displaced = {}
         
         for coll in collections_to_process:
             final_mat_name = self.get_final_mat_name(coll.name)
             
-            if final_mat_name not in bpy.data.materials:
-                blender_material = bpy.data.materials.new(name=final_mat_name)
-            else:
-                blender_material = bpy.data.materials[final_mat_name]
-            
-            mats_in_use.add(blender_material)
-            blender_material.use_nodes = True
-            
-            first_obj_in_group = next(iter(coll.objects), None)
+            group_objects = index["group_objects"].get(coll.name)
             image_datablock = None
-            if first_obj_in_group:
-                image_datablock = get_base_color_texture_from_obj(first_obj_in_group)
-
-            if blender_material.node_tree: 
-                principled_bsdf = None
-                for n in blender_material.node_tree.nodes:
-                    if n.type == 'BSDF_PRINCIPLED':
-                        principled_bsdf = n
-                        break
-                if not principled_bsdf: 
-                    blender_material.node_tree.nodes.clear() 
-                    principled_bsdf = blender_material.node_tree.nodes.new('ShaderNodeBsdfPrincipled')
-                    material_output = blender_material.node_tree.nodes.new('ShaderNodeOutputMaterial')
-                    blender_material.node_tree.links.new(principled_bsdf.outputs['BSDF'], material_output.inputs['Surface'])
-                
-                if image_datablock:
-                    existing_tex_node = None
-                    for node in blender_material.node_tree.nodes:
-                        if node.type == 'TEX_IMAGE' and node.image == image_datablock:
-                            existing_tex_node = node
-                            break
-                    
-                    if not existing_tex_node:
-                        tex_node = blender_material.node_tree.nodes.new('ShaderNodeTexImage')
-                        tex_node.image = image_datablock
-                        blender_material.node_tree.links.new(tex_node.outputs['Color'], principled_bsdf.inputs['Base Color'])
-                    else:
-                        is_linked = False
-                        for link in blender_material.node_tree.links:
-                            if link.from_node == existing_tex_node and link.to_node == principled_bsdf and link.to_socket.name == 'Base Color':
-                                is_linked = True
-                                break
-                        if not is_linked:
-                             blender_material.node_tree.links.new(existing_tex_node.outputs['Color'], principled_bsdf.inputs['Base Color'])
+            if group_objects:
+                image_datablock = index["images"][group_objects[0].as_pointer()]
 
-            for obj in coll.objects:
-                if obj.type == 'MESH':
-                    obj.data.materials.clear()
-                    obj.data.materials.append(blender_material)
-                    materials_assigned_count += 1
-        
-        mats_to_remove = []
-        for mat in bpy.data.materials:
-            if mat.users == 0 and mat not in mats_in_use:
-                mats_to_remove.append(mat)
+            blender_material = ensure_group_material(final_mat_name, image_datablock)
+            mats_in_use.add(blender_material)
+
+            assigned, skipped = assign_single_material(coll.objects, blender_material, displaced)
+            materials_assigned_count += assigned
+            skipped_count += skipped
+        profile_count("objects_touched", materials_assigned_count)
         
-        for mat in mats_to_remove:
-            bpy.data.materials.remove(mat)
+        mats_to_remove = [mat for mat in displaced.values() if mat.users == 0 and mat not in mats_in_use]
+        if mats_to_remove:
+            forget_material_fingerprints(mats_to_remove)
+            bpy.data.batch_remove(mats_to_remove)
                     
-        self.report({'INFO'}, f"Material assignment complete. Updated/set materials for {materials_assigned_count} objects and cleared {len(mats_to_remove)} unused materials.")
+        self.report({'INFO'}, f"Material assignment complete. Updated/set materials for {materials_assigned_count} objects ({skipped_count} already correct) and cleared {len(mats_to_remove)} unused materials.")
         cleanup_material_list(scene)
         return {'FINISHED'}
 
+CONSOLIDATE_BACKUP_COLLECTION = "WTT_Consolidate_Backup"
+
+def get_bool_attribute(mesh, name, domain, count):
+    values = np.zeros(count, dtype=bool)
+    attribute = mesh.attributes.get(name)
+    if attribute and attribute.domain == domain and attribute.data_type == 'BOOLEAN' and count:
+        attribute.data.foreach_get("value", values)
+    return values
+
+def get_world_mesh_arrays(obj, with_normals):
+    mesh = obj.data
+    vert_count = len(mesh.vertices)
+    edge_count = len(mesh.edges)
+    loop_count = len(mesh.loops)
+    face_count = len(mesh.polygons)
+
+    matrix = np.array(obj.matrix_world, dtype=np.float64)
+    positions = np.empty(vert_count * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", positions)
+    positions = positions.reshape(-1, 3) @ matrix[:3, :3].T + matrix[:3, 3]
+
+    edges = np.empty(edge_count * 2, dtype=np.int32)
+    mesh.edges.foreach_get("vertices", edges)
+    loop_verts = np.empty(loop_count, dtype=np.int32)
+    mesh.loops.foreach_get("vertex_index", loop_verts)
+    loop_edges = np.empty(loop_count, dtype=np.int32)
+    mesh.loops.foreach_get("edge_index", loop_edges)
+    loop_starts = np.empty(face_count, dtype=np.int32)
+    mesh.polygons.foreach_get("loop_start", loop_starts)
+    loop_totals = np.empty(face_count, dtype=np.int32)
+    mesh.polygons.foreach_get("loop_total", loop_totals)
+    material_indices = np.empty(face_count, dtype=np.int32)
+    mesh.polygons.foreach_get("material_index", material_indices)
+
+    uvs = np.zeros(loop_count * 2, dtype=np.float32)
+    if mesh.uv_layers.active:
+        mesh.uv_layers.active.data.foreach_get("uv", uvs)
+    uvs = uvs.reshape(-1, 2)
+
+    normals = None
+    if with_normals:
+        normals = np.empty(loop_count * 3, dtype=np.float32)
+        mesh.corner_normals.foreach_get("vector", normals)
+        normals = normals.reshape(-1, 3) @ np.linalg.inv(matrix[:3, :3])
+        lengths = np.linalg.norm(normals, axis=1)
+        normals /= np.where(lengths > 0.0, lengths, 1.0)[:, None]
+
+    if np.linalg.det(matrix[:3, :3]) < 0.0:
+        # Mirrored objects: reverse the winding so the joined faces keep pointing outwards.
+        offsets = np.repeat(loop_starts, loop_totals)
+        ends = offsets + np.repeat(loop_totals, loop_totals) - 1
+        reversed_loops = ends - (np.arange(loop_count) - offsets)
+        previous_loops = np.where(reversed_loops == offsets, ends, reversed_loops - 1)
+        loop_verts = loop_verts[reversed_loops]
+        loop_edges = loop_edges[previous_loops]
+        uvs = uvs[reversed_loops]
+        if normals is not None:
+            normals = normals[reversed_loops]
+
+    return {
+        "positions": positions,
+        "edges": edges,
+        "loop_verts": loop_verts,
+        "loop_edges": loop_edges,
+        "loop_starts": loop_starts,
+        "material_indices": material_indices,
+        "uvs": uvs,
+        "normals": normals,
+        "sharp_edge": get_bool_attribute(mesh, "sharp_edge", 'EDGE', edge_count),
+        "sharp_face": get_bool_attribute(mesh, "sharp_face", 'FACE', face_count),
+    }
+
+def build_combined_mesh(name, objects):
+    with_normals = any(obj.data.has_custom_normals for obj in objects)
+    parts = [get_world_mesh_arrays(obj, with_normals) for obj in objects]
+
+    vert_offsets = np.cumsum([0] + [len(part["positions"]) for part in parts])
+    edge_offsets = np.cumsum([0] + [len(part["edges"]) // 2 for part in parts])
+    loop_offsets = np.cumsum([0] + [len(part["loop_verts"]) for part in parts])
+
+    def concat(key, offsets=None):
+        arrays = [part[key] if offsets is None else part[key] + offsets[i] for i, part in enumerate(parts)]
+        return np.concatenate(arrays) if arrays else np.zeros(0)
+
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(int(vert_offsets[-1]))
+    mesh.edges.add(int(edge_offsets[-1]))
+    mesh.loops.add(int(loop_offsets[-1]))
+    mesh.polygons.add(sum(len(part["loop_starts"]) for part in parts))
+
+    mesh.vertices.foreach_set("co", concat("positions").astype(np.float32).ravel())
+    mesh.edges.foreach_set("vertices", concat("edges", vert_offsets).astype(np.int32))
+    mesh.loops.foreach_set("vertex_index", concat("loop_verts", vert_offsets).astype(np.int32))
+    mesh.loops.foreach_set("edge_index", concat("loop_edges", edge_offsets).astype(np.int32))
+    mesh.polygons.foreach_set("loop_start", concat("loop_starts", loop_offsets).astype(np.int32))
+    mesh.polygons.foreach_set("material_index", concat("material_indices").astype(np.int32))
+
+    mesh.uv_layers.new(name="UVMap").data.foreach_set("uv", concat("uvs").astype(np.float32).ravel())
+    for attr_name, domain in (("sharp_edge", 'EDGE'), ("sharp_face", 'FACE')):
+        values = concat(attr_name).astype(bool)
+        if values.any():
+            mesh.attributes.new(attr_name, 'BOOLEAN', domain).data.foreach_set("value", values)
+
+    mesh.update()
+    if with_normals:
+        mesh.normals_split_custom_set(concat("normals").astype(np.float32))
+
+    for mat in objects[0].data.materials:
+        mesh.materials.append(mat)
+    return mesh
+
+def get_material_bucket_key(obj):
+    return tuple(mat.as_pointer() if mat else 0 for mat in obj.data.materials)
+
+class WTT_OT_ConsolidateGroups(Operator):
+    bl_idname = "wtt.consolidate_groups"
+    bl_label = "Consolidate Groups"
+    bl_description = "Join the meshes of every group into one object per material (originals are kept hidden for Undo)"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    vehicle: StringProperty(default="GROUND")
+
+    def execute(self, context):
+        scene = context.scene
+        work_collection_name = get_vehicle_group_lists(scene, self.vehicle)[0]
+        work_collection = bpy.data.collections.get(work_collection_name)
+        if not work_collection:
+            self.report({'ERROR'}, f"Collection '{work_collection_name}' not found.")
+            return {'CANCELLED'}
+
+        if context.object and context.object.mode != 'OBJECT':
+            bpy.ops.object.mode_set(mode='OBJECT')
+            profile_count("ops_calls")
+
+        consolidate_map = json.loads(scene.wtt_consolidate_map_json or "{}")
+        index = get_scene_index(work_collection_name)
+        new_collections = []
+        backup_collection = get_group_collection(CONSOLIDATE_BACKUP_COLLECTION, new_collections)
+
+        moves = []
+        source_collections = []
+        created = 0
+        for coll in work_collection.children:
+            buckets = {}
+            for obj in index["group_objects"].get(coll.name, []):
+                buckets.setdefault(get_material_bucket_key(obj), []).append(obj)
+
+            for objects in buckets.values():
+                if len(objects) < 2:
+                    continue
+                mats = [mat for mat in objects[0].data.materials if mat]
+                name = mats[0].name if mats else coll.name
+                combined = bpy.data.objects.new(name, build_combined_mesh(name, objects))
+                coll.objects.link(combined)
+
+                consolidate_map[combined.name] = {"group": coll.name, "objects": [obj.name for obj in objects]}
+                moves.extend((obj, backup_collection) for obj in objects)
+                created += 1
+            source_collections.append(coll)
+
+        if not moves:
+            for coll in new_collections:
+                bpy.data.collections.remove(coll)
+            self.report({'INFO'}, "No group has more than one object to consolidate.")
+            return {'CANCELLED'}
+
+        relink_objects(moves, source_collections, scene.collection, new_collections)
+        layer_collection = context.view_layer.layer_collection.children.get(backup_collection.name)
+        if layer_collection:
+            layer_collection.exclude = True
+
+        scene.wtt_consolidate_map_json = json.dumps(consolidate_map, ensure_ascii=False)
+        profile_count("objects_touched", len(moves))
+        self.report({'INFO'}, f"Consolidated {len(moves)} objects into {created} objects.")
+        return {'FINISHED'}
+
+class WTT_OT_UndoConsolidate(Operator):
+    bl_idname = "wtt.undo_consolidate"
+    bl_label = "Undo Consolidate"
+    bl_description = "Restore the original objects of consolidated groups and delete the joined objects"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @classmethod
+    def poll(cls, context):
+        return context.scene is not None and context.scene.wtt_consolidate_map_json not in ("", "{}")
+
+    def execute(self, context):
+        scene = context.scene
+        consolidate_map = json.loads(scene.wtt_consolidate_map_json or "{}")
+        backup_collection = bpy.data.collections.get(CONSOLIDATE_BACKUP_COLLECTION)
+        if not backup_collection:
+            scene.wtt_consolidate_map_json = "{}"
+            self.report({'WARNING'}, f"Collection '{CONSOLIDATE_BACKUP_COLLECTION}' not found, nothing to restore.")
+            return {'CANCELLED'}
+
+        moves = []
+        combined_objects = []
+        for combined_name, entry in consolidate_map.items():
+            group_coll = bpy.data.collections.get(entry["group"])
+            if not group_coll:
+                continue
+            for obj_name in entry["objects"]:
+                obj = backup_collection.objects.get(obj_name)
+                if obj:
+                    moves.append((obj, group_coll))
+            combined = bpy.data.objects.get(combined_name)
+            if combined:
+                combined_objects.append(combined)
+
+        relink_objects(moves, [backup_collection])
+        delete_objects_and_orphans(combined_objects, [backup_collection] if not backup_collection.objects else [])
+
+        scene.wtt_consolidate_map_json = "{}"
+        self.report({'INFO'}, f"Restored {len(moves)} objects, removed {len(combined_objects)} joined objects.")
+        return {'FINISHED'}
+
+def get_mesh_geometry_hash(mesh, tolerance):
+    # Positions are hashed relative to the mesh's bounding-box corner, so the same part placed
+    # elsewhere in the OBJ hashes the same; the corner is returned to re-place the shared mesh.
+    vert_count = len(mesh.vertices)
+    face_count = len(mesh.polygons)
+    positions = np.empty(vert_count * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", positions)
+    positions = positions.reshape(-1, 3).astype(np.float64)
+    anchor = positions.min(axis=0) if vert_count else np.zeros(3)
+
+    loop_verts = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get("vertex_index", loop_verts)
+    loop_starts = np.empty(face_count, dtype=np.int32)
+    mesh.polygons.foreach_get("loop_start", loop_starts)
+    material_indices = np.empty(face_count, dtype=np.int32)
+    mesh.polygons.foreach_get("material_index", material_indices)
+
+    digest = hashlib.sha1()
+    digest.update(np.array([vert_count, len(mesh.edges), len(loop_verts), face_count], dtype=np.int64).tobytes())
+    digest.update(np.round((positions - anchor) / tolerance).astype(np.int64).tobytes())
+    digest.update(loop_verts.tobytes())
+    digest.update(loop_starts.tobytes())
+    digest.update(material_indices.tobytes())
+    if mesh.uv_layers.active:
+        uvs = np.empty(len(loop_verts) * 2, dtype=np.float32)
+        mesh.uv_layers.active.data.foreach_get("uv", uvs)
+        digest.update(np.round(uvs / tolerance).astype(np.int64).tobytes())
+    digest.update(get_bool_attribute(mesh, "sharp_face", 'FACE', face_count).tobytes())
+    digest.update(repr([mat.as_pointer() if mat else 0 for mat in mesh.materials]).encode())
+    return digest.hexdigest(), anchor
+
+class WTT_OT_LinkDuplicates(Operator):
+    bl_idname = "wtt.link_duplicates"
+    bl_label = "Link Duplicate Meshes"
+    bl_description = "Find identical parts (wheels, track links, bolts...) and make them share one mesh. Export still writes every copy"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    vehicle: StringProperty(default="GROUND")
+    tolerance: FloatProperty(
+        name="Tolerance",
+        description="Vertex and UV differences below this are treated as identical",
+        default=0.0001,
+        min=0.000001,
+        max=0.01,
+        precision=6
+    )
+
+    def execute(self, context):
+        work_collection_name = get_vehicle_group_lists(context.scene, self.vehicle)[0]
+        objects = get_scene_index(work_collection_name)["objects"]
+        if not objects:
+            self.report({'INFO'}, "No objects to process in the work collection.")
+            return {'FINISHED'}
+
+        start = time.perf_counter()
+        shared = {}
+        old_meshes = {}
+        relinked = 0
+        for obj in objects:
+            mesh = obj.data
+            if mesh.shape_keys or obj.modifiers:
+                continue
+            geometry_hash, anchor = get_mesh_geometry_hash(mesh, self.tolerance)
+            original = shared.setdefault(geometry_hash, (mesh, anchor))
+            shared_mesh, shared_anchor = original
+            if shared_mesh == mesh:
+                continue
+
+            offset = anchor - shared_anchor
+            obj.data = shared_mesh
+            obj.matrix_world = obj.matrix_world @ Matrix.Translation(offset.tolist())
+            old_meshes[mesh.as_pointer()] = mesh
+            relinked += 1
+
+        orphaned = [mesh for mesh in old_meshes.values() if mesh.users == 0]
+        saved_bytes = sum(estimate_mesh_bytes(mesh) for mesh in orphaned)
+        if orphaned:
+            bpy.data.batch_remove(orphaned)
+
+        profile_count("objects_touched", relinked)
+        self.report({'INFO'}, f"Linked {relinked} of {len(objects)} objects to shared meshes ({len(shared)} unique) in {time.perf_counter() - start:.2f} s, saved ~{saved_bytes / 1048576:.1f} MB of mesh data.")
+        return {'FINISHED'}
+
 class OBJECT_OT_move_wheels(Operator):
     bl_idname = "object.move_wheels"
     bl_label = "Move Wheels"
@@ -1173,30 +3284,22 @@ class OBJECT_OT_move_wheels(Operator):
             self.report({'WARNING'}, "Collection 'Ground_Work' not found.")
             return {'CANCELLED'}
             
-        objects_to_process = get_all_ground_objects(context, include_hidden=False)
-        wheel_objects = [
-            obj for obj in objects_to_process 
-            if obj.type == 'MESH' and ("wheel" in obj.name.lower() or "suspension" in obj.name.lower())
-        ]
+        wheel_objects = find_indexed_objects_by_name(get_scene_index("Ground_Work"), ("wheel", "suspension"))
         
         if not wheel_objects:
             self.report({'INFO'}, "No wheel or suspension objects found.")
             return {'CANCELLED'}
         
         if scene.wtt_group_wheels_toggle:
-            wheel_coll_name = "[Wheels]"
-            if wheel_coll_name not in bpy.data.collections:
-                wheel_coll = bpy.data.collections.new(wheel_coll_name)
-                work_collection.children.link(wheel_coll)
-            else:
-                wheel_coll = bpy.data.collections[wheel_coll_name]
-                
+            new_collections = []
+            wheel_coll = get_group_collection("[Wheels]", new_collections)
+            relink_objects(
+                [(obj, wheel_coll) for obj in wheel_objects],
+                [work_collection] + list(work_collection.children),
+                work_collection,
+                new_collections,
+            )
             for obj in wheel_objects:
-                for coll in obj.users_collection:
-                    if coll == work_collection or coll.name in work_collection.children:
-                        coll.objects.unlink(obj)
-                if obj.name not in wheel_coll.objects:
-                    wheel_coll.objects.link(obj)
                 obj.location.z -= 2
         else:
             for obj in wheel_objects:
@@ -1233,15 +3336,13 @@ class OBJECT_OT_undo_move(Operator):
             objects_to_process = [obj for obj in wheel_coll.objects]
             for obj in objects_to_process:
                 obj.location.z += 2
-                wheel_coll.objects.unlink(obj)
-                work_collection.objects.link(obj)
-            bpy.data.collections.remove(wheel_coll)
+            relink_objects(
+                [(obj, work_collection) for obj in objects_to_process],
+                [wheel_coll],
+                remove_collections=[wheel_coll],
+            )
         else:
-            all_objects = get_all_ground_objects(context, include_hidden=False)
-            objects_to_process = [
-                obj for obj in all_objects 
-                if obj.type == 'MESH' and ("wheel" in obj.name.lower() or "suspension" in obj.name.lower())
-            ]
+            objects_to_process = find_indexed_objects_by_name(get_scene_index("Ground_Work"), ("wheel", "suspension"))
             for obj in objects_to_process:
                 obj.location.z += 2
                 
@@ -1275,9 +3376,11 @@ class WTT_OT_ApplySmooth(Operator):
         # Ensure object mode
         if bpy.context.object and bpy.context.object.mode != 'OBJECT':
             bpy.ops.object.mode_set(mode='OBJECT')
+            profile_count("ops_calls")
 
         # Deselect all
         bpy.ops.object.select_all(action='DESELECT')
+        profile_count("ops_calls")
         
         valid_objects = []
         for obj in objects_to_process:
@@ -1289,6 +3392,7 @@ class WTT_OT_ApplySmooth(Operator):
              self.report({'INFO'}, "No valid mesh objects found.")
              return {'CANCELLED'}
 
+        profile_count("objects_touched", len(valid_objects))
         # Set active object
         context.view_layer.objects.active = valid_objects[0]
         
@@ -1299,12 +3403,14 @@ class WTT_OT_ApplySmooth(Operator):
         # Execute shade smooth by angle (Blender 4.x API)
         try:
             bpy.ops.object.shade_smooth_by_angle(angle=angle_rad)
+            profile_count("ops_calls")
         except Exception as e:
             self.report({'ERROR'}, f"Smooth operation failed: {e}")
             return {'CANCELLED'}
         
         # Cleanup selection
         bpy.ops.object.select_all(action='DESELECT')
+        profile_count("ops_calls")
         
         self.report({'INFO'}, f"Applied smoothing at {angle_deg}° to {len(valid_objects)} objects.")
         return {'FINISHED'}
@@ -1332,11 +3438,17 @@ class WTT_PT_GroundPanel(Panel):
 
         box = layout.box()
         box.label(text="Step 1: Clear")
-        box.operator("object.ground_clear_scene", text="Clear Scene", icon='TRASH')
+        row = box.row(align=True)
+        row.operator("object.ground_clear_scene", text="Clear Scene", icon='TRASH')
+        row.operator("object.ground_clear_scene", text="Full Reset", icon='TRASH').full_reset = True
         
         box = layout.box()
         box.label(text="Step 2: Import")
         box.operator("wtt.import_model", text="Import .obj", icon='IMPORT')
+        row = box.row(align=True)
+        row.operator("wtt.scan_model", text="Scan .obj", icon='VIEWZOOM').vehicle = "GROUND"
+        row.operator("wtt.import_scanned", text="Import Scanned", icon='IMPORT').vehicle = "GROUND"
+        box.prop(scene, "wtt_selective_import")
         
         box = layout.box()
         box.label(text="Step 3: Model Cleanup")
@@ -1344,6 +3456,7 @@ class WTT_PT_GroundPanel(Panel):
         sub_box = box.box()
         sub_box.label(text="Operation 1: Analyze Model")
         sub_box.operator("wtt.analyze_groups")
+        sub_box.prop(scene, "wtt_use_plan_cache")
         
         sub_box = box.box()
         sub_box.label(text="Operation 2: Adjust Groups")
@@ -1424,7 +3537,9 @@ class WTT_PT_GroundPanel(Panel):
         box = layout.box()
         box.label(text="Step 5: UV & Wheels")
         box.operator("object.shift_uv", icon='UV_DATA')
-        box.operator("object.delete_invalid_uv", icon='UV_SYNC_SELECT')
+        row = box.row(align=True)
+        row.operator("object.delete_invalid_uv", icon='UV_SYNC_SELECT')
+        row.operator("object.delete_invalid_uv", text="Count", icon='VIEWZOOM').dry_run = True
         box.separator()
         box.label(text="Wheel Tools:")
         box.prop(scene, "wtt_group_wheels_toggle")
@@ -1440,9 +3555,15 @@ class WTT_PT_GroundPanel(Panel):
 
         box = layout.box()
         box.label(text="Step 7: Export")
+        row = box.row(align=True)
+        row.operator("wtt.consolidate_groups", text="Consolidate Groups", icon='MESH_DATA').vehicle = "GROUND"
+        row.operator("wtt.undo_consolidate", text="Undo", icon='LOOP_BACK')
+        box.operator("wtt.link_duplicates", text="Link Duplicate Meshes", icon='LINKED').vehicle = "GROUND"
         box.operator("wtt.export_model", text="Export .obj", icon='EXPORT')
         # --- End Renumber ---
 
+        draw_profile_section(layout, scene)
+
 class WTT_PT_AirPanel(Panel):
     bl_label = "Air Vehicle Tools"
     bl_idname = "WTT_PT_AirPanel"
@@ -1483,6 +3604,8 @@ class OBJECT_PT_main_panel(Panel):
         row.operator("object.air_vehicle", text="Air Vehicle")
         row.operator("object.ground_vehicle", text="Ground Vehicle")
 
+        draw_profile_section(layout, context.scene)
+
 def on_list_select_air_keep(self, context):
     group_name = ""
     if context.scene.wtt_air_keep_list_index >= 0 and len(context.scene.wtt_air_keep_groups) > context.scene.wtt_air_keep_list_index:
@@ -1494,13 +3617,7 @@ def on_list_select_air_keep(self, context):
     obj_list = list(coll.objects)
     if not obj_list: return
 
-    if bpy.context.object and bpy.context.object.mode != 'OBJECT':
-        bpy.ops.object.mode_set(mode='OBJECT')
-    bpy.ops.object.select_all(action='DESELECT')
-    for obj in obj_list:
-        obj.select_set(True)
-    if obj_list: 
-        bpy.context.view_layer.objects.active = obj_list[0]
+    select_list_objects(context, obj_list, "Aviation_Work")
 
 def on_list_select_air_discard(self, context):
     group_name = ""
@@ -1513,13 +3630,7 @@ def on_list_select_air_discard(self, context):
     obj_list = list(coll.objects)
     if not obj_list: return
 
-    if bpy.context.object and bpy.context.object.mode != 'OBJECT':
-        bpy.ops.object.mode_set(mode='OBJECT')
-    bpy.ops.object.select_all(action='DESELECT')
-    for obj in obj_list:
-        obj.select_set(True)
-    if obj_list: 
-        bpy.context.view_layer.objects.active = obj_list[0]
+    select_list_objects(context, obj_list, "Aviation_Work")
 
 def on_list_select_air_material(self, context):
     mat_name = ""
@@ -1538,34 +3649,30 @@ def on_list_select_air_material(self, context):
                     break
             break
             
-    if bpy.context.object and bpy.context.object.mode != 'OBJECT':
-        bpy.ops.object.mode_set(mode='OBJECT')
-    bpy.ops.object.select_all(action='DESELECT')
-    
-    active_obj_set = False
-    
-    work_collection = bpy.data.collections.get("Aviation_Work")
-    if not work_collection: return
-    
-    collections_to_check = [coll for coll in work_collection.children]
-    
-    for coll in collections_to_check:
-        coll_mat_name = WTT_OT_AirAnalyzeMaterial.get_final_mat_name(coll.name)
-        if coll_mat_name == mat_name:
-            for obj in coll.objects:
-                obj.select_set(True)
-                if not active_obj_set:
-                    context.view_layer.objects.active = obj
-                    active_obj_set = True
+    select_list_objects(context, get_material_group_objects("Aviation_Work", WTT_OT_AirAnalyzeMaterial.get_final_mat_name).get(mat_name, []), "Aviation_Work")
 
 class WTT_OT_AirClearScene(Operator):
     bl_idname = "wtt.air_clear_scene"
     bl_label = "Clear Scene (Air)"
     bl_description = "Warning! This will clear all items in the scene and create a new 'Aviation_Work' collection"
-    
+
+    full_reset: BoolProperty(
+        name="Full Reset",
+        description="Also delete all objects, purge unused meshes, materials and images and free image memory",
+        default=False,
+        options={'SKIP_SAVE'}
+    )
+
     def execute(self, context):
-        for coll in bpy.data.collections:
-            bpy.data.collections.remove(coll)
+        memory_before = get_process_memory_bytes()
+        removed = 0
+        if self.full_reset:
+            removed = full_reset_scene(context)
+        else:
+            for coll in bpy.data.collections:
+                bpy.data.collections.remove(coll)
+            invalidate_scene_index()
+        set_source_model(context.scene, "")
 
         if "Aviation_Work" not in bpy.data.collections:
             geo_collection = bpy.data.collections.new("Aviation_Work")
@@ -1574,14 +3681,20 @@ class WTT_OT_AirClearScene(Operator):
         cleanup_air_scene_props(context.scene)
         cleanup_air_material_list(context.scene)
         
-        self.report({'INFO'}, "Scene cleared, 'Aviation_Work' created.")
+        if self.full_reset:
+            self.report({'INFO'}, f"Scene reset, 'Aviation_Work' created. Removed {removed} datablocks, memory {format_memory(memory_before)} -> {format_memory(get_process_memory_bytes())}.")
+        else:
+            self.report({'INFO'}, "Scene cleared, 'Aviation_Work' created.")
         return {'FINISHED'}
 
-class WTT_OT_AirImportModel(Operator):
+class WTT_OT_AirImportModel(Operator, ImportHelper):
     bl_idname = "wtt.air_import_model"
     bl_label = "Import .obj (Air)"
-    bl_description = "Open .obj import window"
+    bl_description = "Import an .obj split by group into the work collection"
     
+    filename_ext = ".obj"
+    filter_glob: StringProperty(default="*.obj", options={'HIDDEN'})
+
     def execute(self, context):
         work_collection = bpy.data.collections.get("Aviation_Work")
         if work_collection:
@@ -1589,13 +3702,51 @@ class WTT_OT_AirImportModel(Operator):
             if layer_collection:
                 bpy.context.view_layer.active_layer_collection = layer_collection
         
-        bpy.ops.wm.obj_import('INVOKE_DEFAULT')
+        result = bpy.ops.wm.obj_import(filepath=self.filepath, use_split_groups=True)
+        profile_count("ops_calls")
+        invalidate_scene_index()
+        if 'FINISHED' not in result:
+            self.report({'ERROR'}, f"Import of '{self.filepath}' failed.")
+            return {'CANCELLED'}
+
+        set_source_model(context.scene, self.filepath)
         return {'FINISHED'}
 
-class WTT_OT_AirExportModel(Operator):
+class WTT_OT_AirExportModel(Operator, ExportHelper):
     bl_idname = "wtt.air_export_model"
     bl_label = "Export .obj (Air)"
-    bl_description = "Export all models in 'Aviation_Work' as .obj (Please check 'Selection Only' manually)"
+    bl_description = "Export all models in 'Aviation_Work' as .obj with a matching .mtl"
+
+    filename_ext = ".obj"
+    filter_glob: StringProperty(default="*.obj;*.glb", options={'HIDDEN'})
+    file_format: EnumProperty(
+        name="Format",
+        description="File format to write (.glb is written next to the chosen path)",
+        items=[
+            ('OBJ', "OBJ", "Text .obj with a matching .mtl"),
+            ('GLB', "glTF Binary", "Binary .glb with one mesh per material"),
+            ('BOTH', "Both", "Write the .obj and the .glb"),
+        ],
+        default='OBJ'
+    )
+    embed_textures: BoolProperty(
+        name="Embed Textures (.glb)",
+        description="Pack PNG/JPEG textures into the .glb instead of referencing them",
+        default=False
+    )
+    split_by_material: BoolProperty(
+        name="Split by Material",
+        description="Also write one .obj/.mtl per final material (Body.obj, Turret.obj...) next to the combined file",
+        default=False
+    )
+    compress: BoolProperty(
+        name="Gzip",
+        description="Write the .obj files gzip-compressed (.obj.gz)",
+        default=False
+    )
+
+    def check(self, context):
+        return check_export_extension(self)
 
     def execute(self, context):
         work_collection = bpy.data.collections.get("Aviation_Work")
@@ -1605,21 +3756,27 @@ class WTT_OT_AirExportModel(Operator):
 
         if bpy.context.object and bpy.context.object.mode != 'OBJECT':
             bpy.ops.object.mode_set(mode='OBJECT')
-        
-        bpy.ops.object.select_all(action='DESELECT')
+            profile_count("ops_calls")
+
         objects_to_export = get_all_air_objects(context, include_hidden=False)
         
         if not objects_to_export:
             self.report({'WARNING'}, "No exportable objects in 'Aviation_Work' group.")
             return {'CANCELLED'}
 
-        for obj in objects_to_export:
-            obj.select_set(True)
-        
-        if objects_to_export:
-            context.view_layer.objects.active = objects_to_export[0]
-
-        bpy.ops.wm.obj_export('INVOKE_DEFAULT')
+        base_path = get_export_base_path(self.filepath)
+        messages = []
+        if self.file_format in {'OBJ', 'BOTH'}:
+            if self.split_by_material:
+                stats = export_obj_split(base_path + ".obj", get_export_groups("Aviation_Work"), self.compress)
+            else:
+                stats = export_obj_model(base_path + ".obj", objects_to_export, self.compress)
+            messages.append(get_export_message(stats))
+        if self.file_format in {'GLB', 'BOTH'}:
+            stats = export_glb_model(base_path + ".glb", objects_to_export, self.embed_textures)
+            messages.append(get_export_message(stats))
+        profile_count("objects_touched", len(objects_to_export))
+        self.report({'INFO'}, "; ".join(messages) + ".")
         return {'FINISHED'}
 
 class WTT_OT_AirMoveGroup(Operator):
@@ -1711,11 +3868,11 @@ class WTT_OT_AirMergeGroups(Operator):
         if not objects_to_move:
              self.report({'INFO'}, f"Group '{source_item.name}' is empty, no move needed.")
              
-        for obj in objects_to_move:
-            source_coll.objects.unlink(obj)
-            target_coll.objects.link(obj)
-            
-        bpy.data.collections.remove(source_coll)
+        relink_objects(
+            [(obj, target_coll) for obj in objects_to_move],
+            [source_coll],
+            remove_collections=[source_coll],
+        )
         source_list.remove(s_idx)
         
         setattr(scene, source_index_prop, t_idx)
@@ -1775,31 +3932,105 @@ class WTT_OT_AirCancelCleanup(Operator):
             return {'CANCELLED'}
 
         collections_to_dissolve = [coll for coll in work_collection.children]
-        count = 0
+        moves = [(obj, work_collection) for coll in collections_to_dissolve for obj in coll.objects]
+        count = len(moves)
         
-        for coll in collections_to_dissolve:
-            objects_to_move = [obj for obj in coll.objects]
-            for obj in objects_to_move:
-                coll.objects.unlink(obj)
-                work_collection.objects.link(obj)
-                count += 1
-            bpy.data.collections.remove(coll)
+        if collections_to_dissolve:
+            relink_objects(
+                moves,
+                [work_collection] + collections_to_dissolve,
+                remove_collections=collections_to_dissolve,
+            )
 
         cleanup_air_scene_props(scene)
         if count > 0:
             self.report({'INFO'}, "Operation cancelled, models moved back to main group.")
         return {'FINISHED'}
 
+def get_texture_surface_stats(index):
+    # Per texture key of the ungrouped objects: world-space face area, bounding box, and the
+    # largest object (used as the reference object of that texture).
+    stats = {}
+    for obj in index["objects"]:
+        obj_ptr = obj.as_pointer()
+        mesh = obj.data
+        face_count = len(mesh.polygons)
+        if index["groups"][obj_ptr] is not None or not face_count or not index["images"][obj_ptr]:
+            continue
+
+        matrix = np.array(obj.matrix_world, dtype=np.float64)
+        areas = np.empty(face_count, dtype=np.float32)
+        mesh.polygons.foreach_get("area", areas)
+        area = float(areas.sum()) * abs(np.linalg.det(matrix[:3, :3])) ** (2.0 / 3.0)
+
+        positions = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+        mesh.vertices.foreach_get("co", positions)
+        positions = positions.reshape(-1, 3) @ matrix[:3, :3].T + matrix[:3, 3]
+
+        entry = stats.setdefault(index["texture_keys"][obj_ptr], {
+            "area": 0.0,
+            "min": np.full(3, np.inf),
+            "max": np.full(3, -np.inf),
+            "objects": 0,
+            "reference": None,
+            "reference_area": -1.0,
+        })
+        entry["area"] += area
+        entry["min"] = np.minimum(entry["min"], positions.min(axis=0))
+        entry["max"] = np.maximum(entry["max"], positions.max(axis=0))
+        entry["objects"] += 1
+        if area > entry["reference_area"]:
+            entry["reference"] = obj
+            entry["reference_area"] = area
+    return stats
+
+def propose_air_body(index):
+    # The fuselage skin covers the most surface and spans most of the model, so each candidate
+    # texture scores (area share) * (bounding-box diagonal / model diagonal). The confidence is the
+    # winner's share of all scores.
+    stats = get_texture_surface_stats(index)
+    candidates = {
+        key: entry for key, entry in stats.items()
+        if not get_air_discard_group(key) and not is_air_body_only_discard(get_air_texture_info(key))
+    }
+    if not candidates:
+        return None
+
+    total_area = sum(entry["area"] for entry in candidates.values()) or 1.0
+    model_min = np.min([entry["min"] for entry in candidates.values()], axis=0)
+    model_max = np.max([entry["max"] for entry in candidates.values()], axis=0)
+    model_diagonal = float(np.linalg.norm(model_max - model_min)) or 1.0
+
+    scores = {
+        key: (entry["area"] / total_area) * (float(np.linalg.norm(entry["max"] - entry["min"])) / model_diagonal)
+        for key, entry in candidates.items()
+    }
+    best_key = max(scores, key=scores.get)
+    best = candidates[best_key]
+    return {
+        "key": best_key,
+        "object": best["reference"],
+        "area_share": float(best["area"] / total_area),
+        "confidence": float(scores[best_key] / (sum(scores.values()) or 1.0)),
+    }
+
 class WTT_OT_AirSpecifyBody(Operator):
     bl_idname = "wtt.air_specify_body"
     bl_label = "Specify Body"
     bl_description = "Set the selected object and models with the same texture as the [Body] group"
+
+    auto: BoolProperty(
+        name="Auto Body",
+        description="Pick the body texture by surface area and extent instead of the selected object",
+        default=False,
+        options={'SKIP_SAVE'}
+    )
     
     def execute(self, context):
         scene = context.scene
         active_obj = context.active_object
         
-        if not active_obj or active_obj.type != 'MESH':
+        if not self.auto and (not active_obj or active_obj.type != 'MESH'):
             self.report({'WARNING'}, "No object specified")
             return {'CANCELLED'}
             
@@ -1808,51 +4039,78 @@ class WTT_OT_AirSpecifyBody(Operator):
             self.report({'ERROR'}, "Collection 'Aviation_Work' not found.")
             return {'CANCELLED'}
 
+        invalidate_texture_cache()
+        index = get_scene_index("Aviation_Work")
+        confidence = 0.0
+        if self.auto:
+            refresh_rules(self.report)
+            proposal = propose_air_body(index)
+            if not proposal:
+                self.report({'ERROR'}, "No textured object that could be the body was found.")
+                return {'CANCELLED'}
+            active_obj = proposal["object"]
+            confidence = proposal["confidence"]
+            self.report({'INFO'}, f"Auto Body: '{proposal['key']}' via '{active_obj.name}', area share {proposal['area_share']:.0%}, confidence {confidence:.0%}.")
+
         body_image_datablock = get_base_color_texture_from_obj(active_obj)
         if not body_image_datablock:
             self.report({'ERROR'}, "Selected object has no valid texture.")
             return {'CANCELLED'}
         
-        body_coll_name = f"[Body] ({get_texture_filename_key(body_image_datablock)})"
+        body_key = get_texture_filename_key(body_image_datablock)
+        body_coll_name = f"[Body] ({body_key})"
         
         if body_coll_name in bpy.data.collections:
             self.report({'INFO'}, f"Group '{body_coll_name}' already exists.")
             return {'CANCELLED'}
-            
-        body_coll = bpy.data.collections.new(body_coll_name)
-        work_collection.children.link(body_coll)
         
-        objects_to_move = []
-        for obj in work_collection.objects:
-            if obj.type != 'MESH':
-                continue
-            
-            img_db = get_base_color_texture_from_obj(obj)
-            if img_db == body_image_datablock:
-                objects_to_move.append(obj)
+        objects_to_move = [
+            obj for obj in index["key_objects"].get(body_key, [])
+            if index["groups"][obj.as_pointer()] is None and index["images"][obj.as_pointer()] == body_image_datablock
+        ]
         
         if not objects_to_move:
             self.report({'INFO'}, "No matching objects found.")
-            bpy.data.collections.remove(body_coll)
             return {'CANCELLED'}
             
-        for obj in objects_to_move:
-            work_collection.objects.unlink(obj)
-            body_coll.objects.link(obj)
+        body_coll = bpy.data.collections.new(body_coll_name)
+        relink_objects(
+            [(obj, body_coll) for obj in objects_to_move],
+            [work_collection],
+            work_collection,
+            [body_coll],
+        )
             
         scene.wtt_air_keep_groups.add().name = body_coll_name
         scene.wtt_air_body_name = active_obj.name
-        self.report({'INFO'}, f"Moved {len(objects_to_move)} objects to '{body_coll_name}'.")
+        scene.wtt_air_body_confidence = confidence
+        if self.auto:
+            self.report({'INFO'}, f"Moved {len(objects_to_move)} objects to '{body_coll_name}' (confidence {confidence:.0%}).")
+        else:
+            self.report({'INFO'}, f"Moved {len(objects_to_move)} objects to '{body_coll_name}'.")
         return {'FINISHED'}
 
-class WTT_OT_AirGroupOthers(Operator):
+class WTT_OT_AirGroupOthers(TimeSlicedOperator, Operator):
     bl_idname = "wtt.air_group_others"
     bl_label = "Group Others"
-    bl_description = "Analyze and group remaining objects in 'Aviation_Work'"
+    bl_description = "Analyze and group remaining objects in 'Aviation_Work' (Esc cancels)"
 
-    def execute(self, context):
+    def rollback(self, context):
         scene = context.scene
-        work_collection = bpy.data.collections.get("Aviation_Work")
+        if self._moves:
+            undo_relink(self._moves, [self._work_collection] * len(self._moves), self._new_collections)
+        for group_list, count in ((scene.wtt_air_keep_groups, self._keep_count), (scene.wtt_air_discard_groups, self._discard_count)):
+            while len(group_list) > count:
+                group_list.remove(len(group_list) - 1)
+
+    def run_steps(self, context):
+        scene = context.scene
+        self._moves = []
+        self._new_collections = []
+        self._keep_count = len(scene.wtt_air_keep_groups)
+        self._discard_count = len(scene.wtt_air_discard_groups)
+        refresh_rules(self.report)
+        work_collection = self._work_collection = bpy.data.collections.get("Aviation_Work")
         if not work_collection:
             self.report({'WARNING'}, "Collection 'Aviation_Work' not found.")
             return {'CANCELLED'}
@@ -1860,155 +4118,78 @@ class WTT_OT_AirGroupOthers(Operator):
         if not work_collection.objects:
             self.report({'INFO'}, "'Aviation_Work' collection is empty.")
             return {'CANCELLED'}
-            
-        DISCARD_TEX_NAMES = ["inside_", "seat_", "interior_"]
-        
-        discard_map = {} 
-        filepath_to_info = {} 
-        obj_to_key_map = {} 
-        objects_to_classify = [] 
-        
-        objects_to_process = [obj for obj in work_collection.objects]
 
-        for obj in objects_to_process:
-            if obj.type != 'MESH':
-                continue
-                
-            image_datablock = get_base_color_texture_from_obj(obj)
-            tex_filename = get_texture_filename_key(image_datablock)
-            
-            found_discard_rule = False
-            if tex_filename:
-                for rule in DISCARD_TEX_NAMES:
-                    if rule in tex_filename:
-                        group_name = f"[Texture] {rule}"
-                        if group_name not in discard_map:
-                            discard_map[group_name] = []
-                        discard_map[group_name].append(obj)
-                        found_discard_rule = True
-                        break
-                if found_discard_rule:
-                    continue
-                
-                objects_to_classify.append(obj)
-                
-            else:
-                group_name = "[No Texture]"
-                if group_name not in discard_map:
-                    discard_map[group_name] = []
-                discard_map[group_name].append(obj)
-        
-        for obj in objects_to_classify:
-            image_datablock = get_base_color_texture_from_obj(obj)
-            if not image_datablock:
-                continue
-            
-            filename_key = get_texture_filename_key(image_datablock)
-            if not filename_key:
-                continue
+        invalidate_texture_cache()
 
-            obj_to_key_map[obj.name] = filename_key
-
-            if filename_key in filepath_to_info:
-                continue
-
-            current_base_name = "Add"
-            if "pylon" in filename_key:
-                current_base_name = "Pylon"
-            elif "drop_tank" in filename_key:
-                current_base_name = "DropTank"
-            elif "add" in filename_key:
-                 current_base_name = "Add"
-            
-            filepath_to_info[filename_key] = { "base_name": current_base_name }
-        
-        categorized_files = {} 
-        for f_key, info in filepath_to_info.items():
-            base_name = info["base_name"]
-            if base_name not in categorized_files:
-                categorized_files[base_name] = []
-            categorized_files[base_name].append(f_key)
-
-        filename_key_to_final_mat_name = {} 
-        for base_name, filename_key_list in categorized_files.items():
-            if not filename_key_list:
-                continue
-            
-            sorted_filename_key_list = sorted(list(set(filename_key_list))) 
-            
-            if len(sorted_filename_key_list) > 1:
-                for i, f_key in enumerate(sorted_filename_key_list):
-                    suffix = str(i + 1)
-                    final_name = f"{base_name}_{suffix}"
-                    filename_key_to_final_mat_name[f_key] = final_name
-            elif len(sorted_filename_key_list) == 1:
-                final_name = base_name 
-                filename_key_to_final_mat_name[sorted_filename_key_list[0]] = final_name
-
-        final_groups_map = {} 
-        for obj_name, tex_key in obj_to_key_map.items():
-            obj = bpy.data.objects.get(obj_name)
-            if not obj: continue
-            
-            final_name = filename_key_to_final_mat_name.get(tex_key)
-            if not final_name: continue
+        plan = load_group_plan(scene, "AIR") if scene.wtt_use_plan_cache else None
+        if plan:
+            bpy.ops.wtt.air_cancel_cleanup('EXEC_DEFAULT')
+            grouped_count, ungrouped_count = apply_cached_group_plan(context, plan)
+            self.report({'INFO'}, f"Applied the saved plan of this model: {grouped_count} objects grouped ({ungrouped_count} not in the plan).")
+            return {'FINISHED'}
             
-            group_name = f"[{final_name}] ({tex_key})"
-                
-            if group_name not in final_groups_map:
-                final_groups_map[group_name] = []
-            final_groups_map[group_name].append(obj)
+        index = yield from scale_progress(iter_scene_index(work_collection.name), 0.0, 0.5)
+        entries = get_ungrouped_entries(index)
+        profile_count("objects_touched", len(entries))
 
+        final_groups_map, discard_map = plan_air_groups(entries)
+
+        moves = self._moves
+        new_collections = self._new_collections
         for group_name in sorted(final_groups_map.keys()):
             obj_list = final_groups_map[group_name]
             
-            is_pylon_or_tank = "Pylon" in group_name or "DropTank" in group_name
-            
-            if scene.wtt_air_keep_body_only and is_pylon_or_tank:
+            if scene.wtt_air_keep_body_only and is_air_body_only_discard(group_name):
                  scene.wtt_air_discard_groups.add().name = group_name
             else:
                 scene.wtt_air_keep_groups.add().name = group_name
             
-            self.move_objects_to_subcollection(work_collection, group_name, obj_list)
+            new_coll = get_group_collection(group_name, new_collections)
+            moves.extend((obj, new_coll) for obj in obj_list)
 
         for group_name in sorted(discard_map.keys()):
-            obj_list = discard_map[group_name]
             scene.wtt_air_discard_groups.add().name = group_name
-            self.move_objects_to_subcollection(work_collection, group_name, obj_list)
+            new_coll = get_group_collection(group_name, new_collections)
+            moves.extend((obj, new_coll) for obj in discard_map[group_name])
+
+        yield from scale_progress(iter_relink_objects(moves, [work_collection], work_collection, new_collections), 0.5, 1.0)
         
         self.report({'INFO'}, "Grouping of remaining parts complete.")
         return {'FINISHED'}
 
-    def move_objects_to_subcollection(self, work_collection, group_name, obj_list):
-        if group_name not in bpy.data.collections:
-            new_coll = bpy.data.collections.new(group_name)
-            work_collection.children.link(new_coll)
-        else:
-            new_coll = bpy.data.collections[group_name]
-
-        for obj in obj_list:
-            if obj.name in work_collection.objects:
-                work_collection.objects.unlink(obj)
-            if obj.name not in new_coll.objects:
-                new_coll.objects.link(obj)
-
-class WTT_OT_AirExecuteCleanup(Operator):
+class WTT_OT_AirExecuteCleanup(TimeSlicedOperator, Operator):
     bl_idname = "wtt.air_execute_cleanup"
     bl_label = "Execute"
-    bl_description = "Execute Cleanup Operation"
-
-    def execute(self, context):
+    bl_description = "Execute Cleanup Operation (Esc cancels before anything is deleted)"
+
+    def rollback(self, context):
+        if self._moves:
+            undo_relink(self._moves, self._sources, self._new_collections)
+        keep_groups = context.scene.wtt_air_keep_groups
+        for i, old_name, new_name in reversed(self._renames):
+            coll = bpy.data.collections.get(new_name)
+            if coll:
+                coll.name = old_name
+            keep_groups[i].name = old_name
+
+    def run_steps(self, context):
         scene = context.scene
+        self._renames = []
+        self._moves = []
+        self._sources = []
+        self._new_collections = []
         work_collection = bpy.data.collections.get("Aviation_Work")
         
         if not work_collection:
             self.report({'ERROR'}, "Collection 'Aviation_Work' not found.")
             return {'CANCELLED'}
         
+        group_plan = get_group_plan(scene, "AIR")
+
         base_name_map = {}
-        keep_items = list(scene.wtt_air_keep_groups) 
+        keep_items = list(enumerate(scene.wtt_air_keep_groups))
 
-        for item in keep_items:
+        for item_index, item in keep_items:
             old_name = item.name
             if not (old_name.startswith("[") and "]" in old_name):
                 continue
@@ -2018,12 +4199,12 @@ class WTT_OT_AirExecuteCleanup(Operator):
             
             if base_name not in base_name_map:
                 base_name_map[base_name] = []
-            base_name_map[base_name].append(item)
+            base_name_map[base_name].append((item_index, item))
 
         for base_name, items_list in base_name_map.items():
             is_multi_item = len(items_list) > 1
             
-            for i, item in enumerate(items_list):
+            for i, (item_index, item) in enumerate(items_list):
                 old_coll_name = item.name
                 coll = bpy.data.collections.get(old_coll_name)
                 
@@ -2042,6 +4223,8 @@ class WTT_OT_AirExecuteCleanup(Operator):
                     item.name = new_coll_name
                     if coll:
                         coll.name = new_coll_name
+                    self._renames.append((item_index, old_coll_name, item.name))
+        yield 0.1
 
         if not scene.wtt_air_keep_groups and not scene.wtt_air_discard_groups:
             self.report({'INFO'}, "Lists are empty, nothing to execute.")
@@ -2050,50 +4233,49 @@ class WTT_OT_AirExecuteCleanup(Operator):
         discard_group_names = [g.name for g in scene.wtt_air_discard_groups]
 
         if scene.wtt_air_hide_not_delete:
-            hidden_collection_name = "Hidden_Air_Items"
-            if hidden_collection_name not in bpy.data.collections:
-                hidden_collection = bpy.data.collections.new(hidden_collection_name)
-                if hidden_collection.name not in bpy.context.scene.collection.children:
-                    bpy.context.scene.collection.children.link(hidden_collection)
-            else:
-                hidden_collection = bpy.data.collections[hidden_collection_name]
+            new_collections = []
+            hidden_collection = get_group_collection("Hidden_Air_Items", new_collections)
             
-            count = 0
+            colls_to_discard = []
             for group_name in discard_group_names:
                 coll_to_discard = bpy.data.collections.get(group_name)
-                
                 if coll_to_discard and coll_to_discard.name in work_collection.children:
-                    objects_to_move = [obj for obj in coll_to_discard.objects]
-                    for obj in objects_to_move:
-                        coll_to_discard.objects.unlink(obj)
-                        hidden_collection.objects.link(obj)
-                        count += 1
-                    bpy.data.collections.remove(coll_to_discard)
+                    colls_to_discard.append(coll_to_discard)
+
+            moves = self._moves
+            for coll in colls_to_discard:
+                for obj in coll.objects:
+                    moves.append((obj, hidden_collection))
+                    self._sources.append(coll)
+            self._new_collections = new_collections
+            count = len(moves)
+            yield from scale_progress(iter_relink_objects(moves, colls_to_discard, bpy.context.scene.collection, new_collections, colls_to_discard), 0.1, 1.0)
             
+            profile_count("objects_touched", count)
             self.report({'INFO'}, f"Moved {count} objects to 'Hidden_Air_Items'.")
 
         else:
             objects_to_delete = []
             collections_to_delete = []
             
-            for group_name in discard_group_names:
+            for i, group_name in enumerate(discard_group_names):
                 coll_to_delete = bpy.data.collections.get(group_name)
                 if coll_to_delete:
                     collections_to_delete.append(coll_to_delete)
                     for obj in coll_to_delete.objects:
                         objects_to_delete.append(obj)
+                yield 0.1 + 0.8 * (i + 1) / len(discard_group_names)
             
-            count = len(objects_to_delete)
-            if objects_to_delete:
-                for obj in objects_to_delete:
-                    bpy.data.objects.remove(obj, do_unlink=True)
+            # The delete itself is one batch and cannot be interrupted.
+            count, freed_bytes = delete_objects_and_orphans(objects_to_delete, collections_to_delete)
+            profile_count("objects_touched", count)
                 
-            for coll in collections_to_delete:
-                bpy.data.collections.remove(coll)
-                
-            self.report({'INFO'}, f"Deleted {count} objects.")
+            self.report({'INFO'}, f"Deleted {count} objects, freed ~{freed_bytes / 1048576:.1f} MB of mesh and image data.")
 
         cleanup_air_scene_props(scene)
+        plan_error = save_group_plan(scene, group_plan)
+        if plan_error:
+            self.report({'WARNING'}, plan_error)
         self.report({'INFO'}, "Cleanup operation complete.")
         return {'FINISHED'}
 
@@ -2162,73 +4344,36 @@ class WTT_OT_AirExecuteAssignMaterial(Operator):
             return {'CANCELLED'}
         
         collections_to_process = [coll for coll in work_collection.children]
+        invalidate_texture_cache()
+        index = get_scene_index(work_collection.name)
         
         materials_assigned_count = 0
+        skipped_count = 0
         mats_in_use = set()
+        displaced = {}
         
         for coll in collections_to_process:
             final_mat_name = self.get_final_mat_name(coll.name)
             
-            if final_mat_name not in bpy.data.materials:
-                blender_material = bpy.data.materials.new(name=final_mat_name)
-            else:
-                blender_material = bpy.data.materials[final_mat_name]
-            
-            mats_in_use.add(blender_material)
-            blender_material.use_nodes = True
-            
-            first_obj_in_group = next(iter(coll.objects), None)
+            group_objects = index["group_objects"].get(coll.name)
             image_datablock = None
-            if first_obj_in_group:
-                image_datablock = get_base_color_texture_from_obj(first_obj_in_group)
-
-            if blender_material.node_tree: 
-                principled_bsdf = None
-                for n in blender_material.node_tree.nodes:
-                    if n.type == 'BSDF_PRINCIPLED':
-                        principled_bsdf = n
-                        break
-                if not principled_bsdf: 
-                    blender_material.node_tree.nodes.clear() 
-                    principled_bsdf = blender_material.node_tree.nodes.new('ShaderNodeBsdfPrincipled')
-                    material_output = blender_material.node_tree.nodes.new('ShaderNodeOutputMaterial')
-                    blender_material.node_tree.links.new(principled_bsdf.outputs['BSDF'], material_output.inputs['Surface'])
-                
-                if image_datablock:
-                    existing_tex_node = None
-                    for node in blender_material.node_tree.nodes:
-                        if node.type == 'TEX_IMAGE' and node.image == image_datablock:
-                            existing_tex_node = node
-                            break
-                    
-                    if not existing_tex_node:
-                        tex_node = blender_material.node_tree.nodes.new('ShaderNodeTexImage')
-                        tex_node.image = image_datablock
-                        blender_material.node_tree.links.new(tex_node.outputs['Color'], principled_bsdf.inputs['Base Color'])
-                    else:
-                        is_linked = False
-                        for link in blender_material.node_tree.links:
-                            if link.from_node == existing_tex_node and link.to_node == principled_bsdf and link.to_socket.name == 'Base Color':
-                                is_linked = True
-                                break
-                        if not is_linked:
-                             blender_material.node_tree.links.new(existing_tex_node.outputs['Color'], principled_bsdf.inputs['Base Color'])
+            if group_objects:
+                image_datablock = index["images"][group_objects[0].as_pointer()]
 
-            for obj in coll.objects:
-                if obj.type == 'MESH':
-                    obj.data.materials.clear()
-                    obj.data.materials.append(blender_material)
-                    materials_assigned_count += 1
-        
-        mats_to_remove = []
-        for mat in bpy.data.materials:
-            if mat.users == 0 and mat not in mats_in_use:
-                mats_to_remove.append(mat)
+            blender_material = ensure_group_material(final_mat_name, image_datablock)
+            mats_in_use.add(blender_material)
+
+            assigned, skipped = assign_single_material(coll.objects, blender_material, displaced)
+            materials_assigned_count += assigned
+            skipped_count += skipped
+        profile_count("objects_touched", materials_assigned_count)
         
-        for mat in mats_to_remove:
-            bpy.data.materials.remove(mat)
+        mats_to_remove = [mat for mat in displaced.values() if mat.users == 0 and mat not in mats_in_use]
+        if mats_to_remove:
+            forget_material_fingerprints(mats_to_remove)
+            bpy.data.batch_remove(mats_to_remove)
                     
-        self.report({'INFO'}, f"Material assignment complete. Updated/set materials for {materials_assigned_count} objects and cleared {len(mats_to_remove)} unused materials.")
+        self.report({'INFO'}, f"Material assignment complete. Updated/set materials for {materials_assigned_count} objects ({skipped_count} already correct) and cleared {len(mats_to_remove)} unused materials.")
         cleanup_air_material_list(scene)
         return {'FINISHED'}
 
@@ -2244,30 +4389,22 @@ class WTT_OT_AirMoveGear(Operator):
             self.report({'WARNING'}, "Collection 'Aviation_Work' not found.")
             return {'CANCELLED'}
             
-        objects_to_process = get_all_air_objects(context, include_hidden=False)
-        gear_objects = [
-            obj for obj in objects_to_process 
-            if obj.type == 'MESH' and ("wheel" in obj.name.lower() or "gear" in obj.name.lower())
-        ]
+        gear_objects = find_indexed_objects_by_name(get_scene_index("Aviation_Work"), ("wheel", "gear"))
         
         if not gear_objects:
             self.report({'INFO'}, "No landing gear or wheel objects found.")
             return {'CANCELLED'}
         
         if scene.wtt_air_group_wheels_toggle:
-            gear_coll_name = "[Landing_Gear]"
-            if gear_coll_name not in bpy.data.collections:
-                gear_coll = bpy.data.collections.new(gear_coll_name)
-                work_collection.children.link(gear_coll)
-            else:
-                gear_coll = bpy.data.collections[gear_coll_name]
-                
+            new_collections = []
+            gear_coll = get_group_collection("[Landing_Gear]", new_collections)
+            relink_objects(
+                [(obj, gear_coll) for obj in gear_objects],
+                [work_collection] + list(work_collection.children),
+                work_collection,
+                new_collections,
+            )
             for obj in gear_objects:
-                for coll in obj.users_collection:
-                    if coll == work_collection or coll.name in work_collection.children:
-                        coll.objects.unlink(obj)
-                if obj.name not in gear_coll.objects:
-                    gear_coll.objects.link(obj)
                 obj.location.z -= 3
         else:
             for obj in gear_objects:
@@ -2304,15 +4441,13 @@ class WTT_OT_AirUndoMoveGear(Operator):
             objects_to_process = [obj for obj in gear_coll.objects]
             for obj in objects_to_process:
                 obj.location.z += 3
-                gear_coll.objects.unlink(obj)
-                work_collection.objects.link(obj)
-            bpy.data.collections.remove(gear_coll)
+            relink_objects(
+                [(obj, work_collection) for obj in objects_to_process],
+                [gear_coll],
+                remove_collections=[gear_coll],
+            )
         else:
-            all_objects = get_all_air_objects(context, include_hidden=False)
-            objects_to_process = [
-                obj for obj in all_objects 
-                if obj.type == 'MESH' and ("wheel" in obj.name.lower() or "gear" in obj.name.lower())
-            ]
+            objects_to_process = find_indexed_objects_by_name(get_scene_index("Aviation_Work"), ("wheel", "gear"))
             for obj in objects_to_process:
                 obj.location.z += 3
                 
@@ -2342,23 +4477,34 @@ class WTT_PT_AirPanel_Advanced(Panel):
 
         box = layout.box()
         box.label(text="Step 1: Clear")
-        box.operator("wtt.air_clear_scene", text="Clear Scene (Air)", icon='TRASH')
+        row = box.row(align=True)
+        row.operator("wtt.air_clear_scene", text="Clear Scene (Air)", icon='TRASH')
+        row.operator("wtt.air_clear_scene", text="Full Reset", icon='TRASH').full_reset = True
         
         box = layout.box()
         box.label(text="Step 2: Import")
         box.operator("wtt.air_import_model", text="Import .obj (Air)", icon='IMPORT')
+        row = box.row(align=True)
+        row.operator("wtt.scan_model", text="Scan .obj", icon='VIEWZOOM').vehicle = "AIR"
+        row.operator("wtt.import_scanned", text="Import Scanned", icon='IMPORT').vehicle = "AIR"
+        box.prop(scene, "wtt_selective_import")
         
         box = layout.box()
         box.label(text="Step 3: Model Cleanup")
         
         sub_box = box.box()
         sub_box.label(text="Operation 1: Analyze Model")
-        sub_box.operator("wtt.air_specify_body", icon='RESTRICT_SELECT_OFF')
+        row = sub_box.row(align=True)
+        row.operator("wtt.air_specify_body", icon='RESTRICT_SELECT_OFF')
+        row.operator("wtt.air_specify_body", text="Auto Body", icon='AUTO').auto = True
         row = sub_box.row(align=True)
         row.label(text="Current Body:")
         row.prop(scene, "wtt_air_body_name", text="", emboss=False)
+        if scene.wtt_air_body_confidence > 0.0:
+            row.label(text=f"Confidence: {scene.wtt_air_body_confidence:.0%}")
         sub_box.prop(scene, "wtt_air_keep_body_only")
         sub_box.operator("wtt.air_group_others", icon_value=0)
+        sub_box.prop(scene, "wtt_use_plan_cache")
         
         sub_box = box.box()
         sub_box.label(text="Operation 2: Adjust Groups")
@@ -2439,7 +4585,9 @@ class WTT_PT_AirPanel_Advanced(Panel):
         box = layout.box()
         box.label(text="Step 5: UV & Landing Gear")
         box.operator("object.shift_uv", icon='UV_DATA')
-        box.operator("object.delete_invalid_uv", icon='UV_SYNC_SELECT')
+        row = box.row(align=True)
+        row.operator("object.delete_invalid_uv", icon='UV_SYNC_SELECT')
+        row.operator("object.delete_invalid_uv", text="Count", icon='VIEWZOOM').dry_run = True
         box.separator()
         box.label(text="Landing Gear Tools:")
         box.prop(scene, "wtt_air_group_wheels_toggle")
@@ -2455,9 +4603,182 @@ class WTT_PT_AirPanel_Advanced(Panel):
 
         box = layout.box()
         box.label(text="Step 7: Export")
+        row = box.row(align=True)
+        row.operator("wtt.consolidate_groups", text="Consolidate Groups", icon='MESH_DATA').vehicle = "AIR"
+        row.operator("wtt.undo_consolidate", text="Undo", icon='LOOP_BACK')
+        box.operator("wtt.link_duplicates", text="Link Duplicate Meshes", icon='LINKED').vehicle = "AIR"
         box.operator("wtt.air_export_model", text="Export .obj (Air)", icon='EXPORT')
         # --- End Renumber ---
 
+        draw_profile_section(layout, scene)
+
+# --- Headless batch pipeline ---
+def find_obj_mtl_pairs(input_path):
+    if os.path.isfile(input_path):
+        obj_paths = [input_path]
+    else:
+        obj_paths = [
+            os.path.join(input_path, f) for f in sorted(os.listdir(input_path))
+            if f.lower().endswith(".obj")
+        ]
+
+    pairs = []
+    for obj_path in obj_paths:
+        mtl_path = os.path.splitext(obj_path)[0] + ".mtl"
+        pairs.append((obj_path, mtl_path if os.path.isfile(mtl_path) else None))
+    return pairs
+
+def run_pipeline_step(summary, step_name, op, **kwargs):
+    start = time.perf_counter()
+    result = op(**kwargs)
+    summary["steps"].append({
+        "name": step_name,
+        "result": sorted(result),
+        "seconds": round(time.perf_counter() - start, 4),
+    })
+    if 'FINISHED' not in result:
+        raise RuntimeError(f"Step '{step_name}' returned {sorted(result)}")
+
+PIPELINE_OPERATORS = {
+    "GROUND": {
+        "clear_scene": "object.ground_clear_scene",
+        "analyze_groups": "wtt.analyze_groups",
+        "execute_cleanup": "wtt.execute_cleanup",
+        "analyze_material": "wtt.analyze_material",
+        "assign_material": "wtt.execute_assign_material",
+        "export": "wtt.export_model",
+    },
+    "AIR": {
+        "clear_scene": "wtt.air_clear_scene",
+        "specify_body": "wtt.air_specify_body",
+        "analyze_groups": "wtt.air_group_others",
+        "execute_cleanup": "wtt.air_execute_cleanup",
+        "analyze_material": "wtt.air_analyze_material",
+        "assign_material": "wtt.air_execute_assign_material",
+        "export": "wtt.air_export_model",
+    },
+}
+
+def get_pipeline_operator(vehicle, step_name):
+    category, op_name = PIPELINE_OPERATORS[vehicle][step_name].split(".")
+    return getattr(getattr(bpy.ops, category), op_name)
+
+def process_vehicle(obj_path, output_dir, vehicle="GROUND", selective=False):
+    context = bpy.context
+    scene = context.scene
+    vehicle_name = os.path.splitext(os.path.basename(obj_path))[0]
+    export_path = os.path.join(output_dir, f"{vehicle_name}.obj")
+
+    summary = {
+        "vehicle": vehicle_name,
+        "type": vehicle,
+        "source": obj_path,
+        "output": export_path,
+        "status": "FAILED",
+        "error": "",
+        "steps": [],
+        "keep_groups": [],
+        "discard_groups": [],
+        "objects_imported": 0,
+        "objects_exported": 0,
+        "materials": [],
+    }
+    start = time.perf_counter()
+
+    try:
+        scene.wtt_show_ground_panel = vehicle == "GROUND"
+        scene.wtt_show_air_panel_adv = vehicle == "AIR"
+        scene.wtt_hide_not_delete = False
+        scene.wtt_air_hide_not_delete = False
+
+        run_pipeline_step(summary, "clear_scene", get_pipeline_operator(vehicle, "clear_scene"), full_reset=True)
+
+        work_name, keep_list, discard_list = get_vehicle_group_lists(scene, vehicle)
+        work_collection = bpy.data.collections[work_name]
+        layer_collection = context.view_layer.layer_collection.children.get(work_collection.name)
+        if layer_collection:
+            context.view_layer.active_layer_collection = layer_collection
+
+        import_path = obj_path
+        temp_dir = None
+        if selective:
+            step_start = time.perf_counter()
+            plan = build_scan_plan(scan_obj_file(obj_path), vehicle)
+            discard_obj_names = {name for group_name in plan["discard"] for name in plan["groups"][group_name]}
+            if discard_obj_names:
+                try:
+                    temp_dir, import_path = write_selective_obj(obj_path, discard_obj_names)
+                    summary["skipped_groups"] = plan["discard"]
+                except (ValueError, OSError) as e:
+                    summary["selective_error"] = str(e)
+            summary["steps"].append({
+                "name": "scan",
+                "result": ["FINISHED"],
+                "seconds": round(time.perf_counter() - step_start, 4),
+            })
+
+        try:
+            run_pipeline_step(summary, "import", bpy.ops.wm.obj_import, filepath=import_path, use_split_groups=True)
+        finally:
+            if temp_dir:
+                shutil.rmtree(temp_dir, ignore_errors=True)
+            invalidate_scene_index()
+        set_source_model(scene, obj_path)
+        summary["objects_imported"] = len(get_scene_index(work_name)["objects"])
+
+        if vehicle == "AIR":
+            # No one is there to click the fuselage, so the body texture is picked by surface area.
+            run_pipeline_step(summary, "specify_body", get_pipeline_operator(vehicle, "specify_body"), auto=True)
+            summary["body"] = scene.wtt_air_body_name
+            summary["body_confidence"] = round(scene.wtt_air_body_confidence, 3)
+
+        run_pipeline_step(summary, "analyze_groups", get_pipeline_operator(vehicle, "analyze_groups"))
+        summary["keep_groups"] = [g.name for g in keep_list]
+        summary["discard_groups"] = [g.name for g in discard_list]
+
+        run_pipeline_step(summary, "execute_cleanup", get_pipeline_operator(vehicle, "execute_cleanup"))
+        run_pipeline_step(summary, "analyze_material", get_pipeline_operator(vehicle, "analyze_material"))
+        material_list = scene.wtt_air_material_list if vehicle == "AIR" else scene.wtt_material_list
+        summary["materials"] = [m.name for m in material_list]
+
+        run_pipeline_step(summary, "assign_material", get_pipeline_operator(vehicle, "assign_material"))
+        run_pipeline_step(summary, "shift_uv", bpy.ops.object.shift_uv)
+
+        summary["objects_exported"] = len(get_scene_index(work_name)["objects"])
+
+        os.makedirs(output_dir, exist_ok=True)
+        run_pipeline_step(summary, "export", get_pipeline_operator(vehicle, "export"), filepath=export_path)
+        summary["status"] = "OK"
+    except Exception as e:
+        summary["error"] = str(e)
+
+    summary["seconds"] = round(time.perf_counter() - start, 4)
+    return summary
+
+def iter_batch_process_directory(input_path, output_dir, vehicle="GROUND", selective=False):
+    # Yields each vehicle's summary once its JSON is written, so the driver can show progress.
+    os.makedirs(output_dir, exist_ok=True)
+
+    for obj_path, mtl_path in find_obj_mtl_pairs(input_path):
+        vehicle_name = os.path.splitext(os.path.basename(obj_path))[0]
+        if not mtl_path:
+            summary = {
+                "vehicle": vehicle_name,
+                "source": obj_path,
+                "status": "SKIPPED",
+                "error": "No matching .mtl file next to the .obj file.",
+            }
+        else:
+            summary = process_vehicle(obj_path, output_dir, vehicle=vehicle, selective=selective)
+
+        with open(os.path.join(output_dir, f"{vehicle_name}.json"), "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2, ensure_ascii=False)
+        yield summary
+
+def batch_process_directory(input_path, output_dir, vehicle="GROUND", selective=False):
+    return list(iter_batch_process_directory(input_path, output_dir, vehicle=vehicle, selective=selective))
+# --- End of Headless batch pipeline ---
+
 classes = (
     OBJECT_OT_main_menu,
     OBJECT_OT_air_vehicle,
@@ -2481,6 +4802,8 @@ classes = (
     WTT_OT_CancelCleanup,  
     WTT_PT_GroundPanel, 
     WTT_OT_ImportModel,
+    WTT_OT_ScanModel,
+    WTT_OT_ImportScanned,
     WTT_OT_ExportModel,
     WTT_OT_AnalyzeMaterial,
     WTT_OT_ExecuteAssignMaterial,
@@ -2507,10 +4830,21 @@ classes = (
     WTT_OT_AirMoveGear,
     WTT_OT_AirUndoMoveGear,
     WTT_PT_AirPanel_Advanced,
+    WTT_OT_ExportProfile,
+    WTT_OT_ClearProfile,
+    WTT_OT_ConsolidateGroups,
+    WTT_OT_UndoConsolidate,
+    WTT_OT_LinkDuplicates,
 )
 
 def register():
+    bpy.app.handlers.depsgraph_update_post.append(on_depsgraph_update_post)
+    bpy.app.handlers.load_post.append(on_load_post)
+    bpy.app.handlers.undo_post.append(on_undo_redo_post)
+    bpy.app.handlers.redo_post.append(on_undo_redo_post)
     for cls in classes:
+        if issubclass(cls, Operator) and cls not in (WTT_OT_ExportProfile, WTT_OT_ClearProfile):
+            profile_operator_execute(cls)
         bpy.utils.register_class(cls)
     
     bpy.types.Scene.show_secondary_panel = BoolProperty(default=False)
@@ -2532,6 +4866,11 @@ def register():
         default=False
     )
     bpy.types.Scene.wtt_show_ground_panel = BoolProperty(default=False)
+    bpy.types.Scene.wtt_show_profile = BoolProperty(
+        name="Profiling",
+        description="Show the timings and counters of the last operations",
+        default=False
+    )
     bpy.types.Scene.wtt_keep_groups = CollectionProperty(type=WTT_GroupListItem)
     bpy.types.Scene.wtt_discard_groups = CollectionProperty(type=WTT_GroupListItem)
     bpy.types.Scene.wtt_keep_list_index = IntProperty(default=0, update=on_list_select_keep)
@@ -2539,6 +4878,20 @@ def register():
     bpy.types.Scene.wtt_material_list = CollectionProperty(type=WTT_MaterialListItem)
     bpy.types.Scene.wtt_material_list_index = IntProperty(default=0, update=on_list_select_material)
     bpy.types.Scene.wtt_obj_map_json = StringProperty(default="{}")
+    bpy.types.Scene.wtt_source_obj = StringProperty(default="")
+    bpy.types.Scene.wtt_source_hash = StringProperty(default="")
+    bpy.types.Scene.wtt_use_plan_cache = BoolProperty(
+        name="Reuse saved plan",
+        description="When the imported .obj/.mtl was grouped and executed before, restore that grouping instead of re-analyzing",
+        default=True
+    )
+    bpy.types.Scene.wtt_scan_plan_json = StringProperty(default="")
+    bpy.types.Scene.wtt_consolidate_map_json = StringProperty(default="{}")
+    bpy.types.Scene.wtt_selective_import = BoolProperty(
+        name="Skip discarded groups",
+        description="When checked, 'Import Scanned' does not load the geometry of groups in the Discard list",
+        default=True
+    )
     bpy.types.Scene.wtt_hide_not_delete = BoolProperty(
         name="Group instead of deleting",
         description="When checked, non-kept items will be moved to 'Hidden_Items' collection",
@@ -2563,6 +4916,7 @@ def register():
         name="Body Model",
         default="N/A"
     )
+    bpy.types.Scene.wtt_air_body_confidence = FloatProperty(default=0.0)
     bpy.types.Scene.wtt_air_keep_groups = CollectionProperty(type=WTT_Air_GroupListItem)
     bpy.types.Scene.wtt_air_discard_groups = CollectionProperty(type=WTT_Air_GroupListItem)
     bpy.types.Scene.wtt_air_keep_list_index = IntProperty(default=0, update=on_list_select_air_keep)
@@ -2577,8 +4931,18 @@ def register():
 
 
 def unregister():
+    if on_depsgraph_update_post in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(on_depsgraph_update_post)
+    if on_load_post in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(on_load_post)
+    for handlers in (bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        if on_undo_redo_post in handlers:
+            handlers.remove(on_undo_redo_post)
+    invalidate_texture_cache()
     for cls in reversed(classes):
         bpy.utils.unregister_class(cls)
+        if issubclass(cls, Operator):
+            unprofile_operator_execute(cls)
         
     del bpy.types.Scene.show_secondary_panel
     del bpy.types.Scene.vehicle_type
@@ -2588,6 +4952,7 @@ def unregister():
     del bpy.types.Scene.wheels_moved
     del bpy.types.Scene.wtt_group_wheels_toggle
     del bpy.types.Scene.wtt_show_ground_panel
+    del bpy.types.Scene.wtt_show_profile
     del bpy.types.Scene.wtt_keep_groups
     if hasattr(bpy.types.Scene, 'wtt_discard_groups'):
         del bpy.types.Scene.wtt_discard_groups
@@ -2599,6 +4964,12 @@ def unregister():
     del bpy.types.Scene.wtt_material_list_index
     if hasattr(bpy.types.Scene, 'wtt_obj_map_json'):
         del bpy.types.Scene.wtt_obj_map_json
+    del bpy.types.Scene.wtt_source_obj
+    del bpy.types.Scene.wtt_source_hash
+    del bpy.types.Scene.wtt_use_plan_cache
+    del bpy.types.Scene.wtt_scan_plan_json
+    del bpy.types.Scene.wtt_consolidate_map_json
+    del bpy.types.Scene.wtt_selective_import
     del bpy.types.Scene.wtt_hide_not_delete
     
     del bpy.types.Scene.wtt_show_air_panel
@@ -2607,6 +4978,7 @@ def unregister():
     del bpy.types.Scene.wtt_air_group_wheels_toggle
     del bpy.types.Scene.wtt_air_keep_body_only
     del bpy.types.Scene.wtt_air_body_name
+    del bpy.types.Scene.wtt_air_body_confidence
     del bpy.types.Scene.wtt_air_keep_groups
     del bpy.types.Scene.wtt_air_discard_groups
     del bpy.types.Scene.wtt_air_keep_list_index
@@ -0,0 +1,61 @@
+# Headless entry point for the Model Repair Tool.
+#
+# Usage:
+#   blender --background --factory-startup --python wtt_batch.py -- <folder or .obj> [--output <folder>]
+#       [--vehicle ground|air]
+#
+# Every .obj/.mtl pair is run through Clear Scene -> Import -> Group -> Execute ->
+# Analyze/Assign Materials -> Shift UV -> Export, and a JSON summary is written
+# per vehicle into the output folder. Air vehicles get an Auto Body step before Group.
+
+import argparse
+import importlib
+import os
+import sys
+
+import bpy
+
+def load_addon():
+    for module in list(sys.modules.values()):
+        if hasattr(module, "iter_batch_process_directory") and hasattr(module, "bl_info"):
+            break
+    else:
+        addon_dir = os.path.dirname(os.path.abspath(__file__))
+        sys.path.insert(0, os.path.dirname(addon_dir))
+        module = importlib.import_module(os.path.basename(addon_dir))
+
+    if not hasattr(bpy.types.Scene, "wtt_keep_groups"):
+        module.register()
+    return module
+
+def parse_args():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(prog="wtt_batch.py")
+    parser.add_argument("input", help="Folder with .obj/.mtl pairs, or a single .obj file")
+    parser.add_argument("--output", default="", help="Output folder (default: <input>/wtt_output)")
+    parser.add_argument("--selective", action="store_true", help="Do not import the geometry of discarded groups")
+    parser.add_argument("--vehicle", choices=["ground", "air"], default="ground", help="Vehicle type of the models")
+    return parser.parse_args(argv)
+
+def main():
+    args = parse_args()
+    input_path = os.path.abspath(args.input)
+    output_dir = args.output
+    if not output_dir:
+        base_dir = input_path if os.path.isdir(input_path) else os.path.dirname(input_path)
+        output_dir = os.path.join(base_dir, "wtt_output")
+
+    wtt = load_addon()
+    summaries = []
+    for summary in wtt.iter_batch_process_directory(
+        input_path, os.path.abspath(output_dir), vehicle=args.vehicle.upper(), selective=args.selective
+    ):
+        print(f"[WTT] {summary['vehicle']}: {summary['status']} {summary.get('error', '')}")
+        summaries.append(summary)
+
+    failed = [s for s in summaries if s["status"] == "FAILED"]
+    print(f"[WTT] Processed {len(summaries)} vehicles, {len(failed)} failed.")
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+# Parallel driver for the headless batch pipeline (runs with a plain Python, not inside Blender).
+#
+# Usage:
+#   python wtt_batch_pool.py <folder> --output <folder> [--workers N] [--retries N] [--blender <path>]
+#       [--vehicle ground|air]
+#
+# N Blender workers pull vehicles from a shared queue. Every vehicle runs in its own
+# `blender --background` process via wtt_batch.py, so a crash or leak only costs that
+# vehicle; failed vehicles are retried, and all per-vehicle summaries are collected
+# into <output>/batch_report.json.
+
+import argparse
+import json
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+
+BATCH_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "wtt_batch.py")
+
+def find_vehicles(input_dir):
+    return [
+        os.path.join(input_dir, f) for f in sorted(os.listdir(input_dir))
+        if f.lower().endswith(".obj")
+    ]
+
+def run_vehicle(blender, obj_path, output_dir, timeout, extra_args):
+    vehicle_name = os.path.splitext(os.path.basename(obj_path))[0]
+    summary_path = os.path.join(output_dir, f"{vehicle_name}.json")
+    log_path = os.path.join(output_dir, "logs", f"{vehicle_name}.log")
+
+    if os.path.exists(summary_path):
+        os.remove(summary_path)
+
+    cmd = [
+        blender, "--background", "--factory-startup",
+        "--python", BATCH_SCRIPT, "--",
+        obj_path, "--output", output_dir,
+    ] + extra_args
+    with open(log_path, "a", encoding="utf-8") as log:
+        try:
+            returncode = subprocess.run(cmd, stdout=log, stderr=subprocess.STDOUT, timeout=timeout).returncode
+        except subprocess.TimeoutExpired:
+            return {"vehicle": vehicle_name, "source": obj_path, "status": "FAILED", "error": f"Timed out after {timeout}s."}
+
+    if os.path.exists(summary_path):
+        with open(summary_path, encoding="utf-8") as f:
+            return json.load(f)
+    return {"vehicle": vehicle_name, "source": obj_path, "status": "FAILED", "error": f"Blender exited with code {returncode} without a summary."}
+
+def worker(worker_id, jobs, results, args):
+    while True:
+        try:
+            obj_path = jobs.get_nowait()
+        except queue.Empty:
+            return
+
+        attempts = 0
+        start = time.perf_counter()
+        while True:
+            attempts += 1
+            summary = run_vehicle(args.blender, obj_path, args.output, args.timeout, args.extra_args)
+            if summary["status"] != "FAILED" or attempts > args.retries:
+                break
+            print(f"[WTT] worker {worker_id}: {summary['vehicle']} failed ({summary.get('error', '')}), retrying...")
+
+        summary["attempts"] = attempts
+        summary["worker"] = worker_id
+        summary["wall_seconds"] = round(time.perf_counter() - start, 4)
+        results.append(summary)
+        print(f"[WTT] worker {worker_id}: {summary['vehicle']} {summary['status']} ({len(results)}/{args.total})")
+
+def parse_args():
+    parser = argparse.ArgumentParser(prog="wtt_batch_pool.py")
+    parser.add_argument("input", help="Folder with .obj/.mtl pairs")
+    parser.add_argument("--output", default="", help="Output folder (default: <input>/wtt_output)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Number of Blender workers")
+    parser.add_argument("--retries", type=int, default=1, help="Retries per failed vehicle")
+    parser.add_argument("--timeout", type=float, default=None, help="Seconds before a vehicle is killed")
+    parser.add_argument("--blender", default=os.environ.get("BLENDER", "blender"), help="Path to the Blender executable")
+    parser.add_argument("--selective", action="store_true", help="Do not import the geometry of discarded groups")
+    parser.add_argument("--vehicle", choices=["ground", "air"], default="ground", help="Vehicle type of the models")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    args.input = os.path.abspath(args.input)
+    args.output = os.path.abspath(args.output or os.path.join(args.input, "wtt_output"))
+    args.extra_args = ["--vehicle", args.vehicle] + (["--selective"] if args.selective else [])
+    os.makedirs(os.path.join(args.output, "logs"), exist_ok=True)
+
+    vehicles = find_vehicles(args.input)
+    args.total = len(vehicles)
+    jobs = queue.Queue()
+    for obj_path in vehicles:
+        jobs.put(obj_path)
+
+    results = []
+    start = time.perf_counter()
+    threads = [
+        threading.Thread(target=worker, args=(i + 1, jobs, results, args), daemon=True)
+        for i in range(max(1, min(args.workers, len(vehicles))))
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    results.sort(key=lambda s: s["vehicle"])
+    counts = {}
+    for s in results:
+        counts[s["status"]] = counts.get(s["status"], 0) + 1
+
+    report = {
+        "input": args.input,
+        "output": args.output,
+        "workers": len(threads),
+        "vehicles": len(results),
+        "status_counts": counts,
+        "wall_seconds": round(time.perf_counter() - start, 4),
+        "vehicle_seconds": round(sum(s.get("wall_seconds", 0.0) for s in results), 4),
+        "results": results,
+    }
+    with open(os.path.join(args.output, "batch_report.json"), "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    print(f"[WTT] Done in {report['wall_seconds']}s: {counts}")
+    sys.exit(1 if counts.get("FAILED") else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+# Synthetic-vehicle benchmark for the Model Repair Tool.
+#
+# Usage:
+#   blender --background --factory-startup --python wtt_benchmark.py -- [--sizes 1000 10000 50000]
+#       [--textures 64] [--vehicle ground|air|both] [--output <folder>] [--seed 0]
+#
+# For every size a Ground_Work / Aviation_Work scene is generated with gamemodels3d-style
+# object names and texture filenames, every operator of the workflow is run in order and
+# timed, and the results are written to <output>/wtt_benchmark.json and .csv so runs can
+# be compared across releases.
+
+import argparse
+import csv
+import json
+import os
+import random
+import sys
+import time
+
+import bpy
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from wtt_batch import load_addon
+
+GROUND_TEXTURE_PATTERNS = [
+    "{v}_body_c.dds", "{v}_body_add_c.dds", "{v}_turret_c.dds", "{v}_turret_add_c.dds",
+    "{v}_gun_c.dds", "{v}_track_c.dds", "{v}_glass_c.dds", "{v}_mg_c.dds", "{v}_net_c.dds",
+    "{v}_decal_c.dds",
+]
+GROUND_NAME_PATTERNS = [
+    "{v}_body_{i}", "{v}_turret_{i}", "{v}_gun_barrel_{i}", "{v}_track_l_{i}",
+    "{v}_mg_{i}", "net_{i}", "{v}_wheel_r{i}", "{v}_hatch_{i}",
+]
+AIR_TEXTURE_PATTERNS = [
+    "{v}_body_c.dds", "{v}_wing_c.dds", "{v}_pylon_c.dds", "{v}_drop_tank_c.dds",
+    "inside_{v}_c.dds", "seat_{v}_c.dds", "interior_{v}_c.dds", "{v}_gear_c.dds",
+]
+AIR_NAME_PATTERNS = [
+    "{v}_body_{i}", "{v}_wing_l_{i}", "{v}_pylon_{i}", "{v}_drop_tank_{i}",
+    "inside_{i}", "{v}_gear_c_{i}", "{v}_flap_{i}", "{v}_gun_{i}",
+]
+
+GROUND_STEPS = [
+    ("analyze_groups", "wtt.analyze_groups"),
+    ("execute_cleanup", "wtt.execute_cleanup"),
+    ("analyze_material", "wtt.analyze_material"),
+    ("execute_assign_material", "wtt.execute_assign_material"),
+    ("shift_uv", "object.shift_uv"),
+    ("delete_invalid_uv", "object.delete_invalid_uv"),
+    ("apply_smooth", "wtt.apply_smooth"),
+]
+AIR_STEPS = [
+    ("air_specify_body", "wtt.air_specify_body"),
+    ("air_group_others", "wtt.air_group_others"),
+    ("air_execute_cleanup", "wtt.air_execute_cleanup"),
+    ("air_analyze_material", "wtt.air_analyze_material"),
+    ("air_execute_assign_material", "wtt.air_execute_assign_material"),
+    ("shift_uv", "object.shift_uv"),
+    ("delete_invalid_uv", "object.delete_invalid_uv"),
+    ("apply_smooth", "wtt.apply_smooth"),
+]
+
+CSV_FIELDS = ["vehicle", "objects", "textures", "step", "result", "seconds", "objects_after"]
+
+def clear_data():
+    data = []
+    for coll in (bpy.data.objects, bpy.data.meshes, bpy.data.materials, bpy.data.images, bpy.data.collections):
+        data.extend(coll)
+    if data:
+        bpy.data.batch_remove(data)
+
+def create_template_mesh():
+    # A 3x3 grid with UVs outside the 0-1 square, plus a sliver face whose UV sits on a tile
+    # border so Shift UV and Delete Small Islands both have work to do.
+    verts = [(x, y, 0.0) for y in range(4) for x in range(4)] + [(4.0, 0.0, 0.0), (4.0, 0.01, 0.0)]
+    faces = [(y * 4 + x, y * 4 + x + 1, y * 4 + x + 5, y * 4 + x + 4) for y in range(3) for x in range(3)]
+    faces.append((3, 16, 17))
+    mesh = bpy.data.meshes.new("wtt_bench_template")
+    mesh.from_pydata(verts, [], faces)
+    uv_layer = mesh.uv_layers.new(name="UVMap")
+    for poly in mesh.polygons:
+        for loop_index in poly.loop_indices:
+            co = mesh.vertices[mesh.loops[loop_index].vertex_index].co
+            uv_layer.data[loop_index].uv = (co.x / 3.0 + 2.0, co.y / 3.0 - 1.0)
+    uv_layer.data[mesh.polygons[-1].loop_start].uv = (1.0, 0.0)
+    mesh.update()
+    return mesh
+
+def create_texture_materials(texture_patterns, texture_count):
+    materials = []
+    for i in range(texture_count):
+        pattern = texture_patterns[i % len(texture_patterns)]
+        filename = pattern.format(v=f"veh{i // len(texture_patterns)}")
+
+        image = bpy.data.images.new(filename, 4, 4)
+        image.filepath_raw = f"//textures/{filename}"
+
+        mat = bpy.data.materials.new(f"mat_{i}")
+        mat.use_nodes = True
+        nodes = mat.node_tree.nodes
+        bsdf = nodes.get("Principled BSDF")
+        tex_node = nodes.new(type="ShaderNodeTexImage")
+        tex_node.image = image
+        if bsdf:
+            mat.node_tree.links.new(tex_node.outputs["Color"], bsdf.inputs["Base Color"])
+        materials.append(mat)
+    return materials
+
+def generate_scene(vehicle, object_count, texture_count, seed):
+    if vehicle == "ground":
+        bpy.ops.object.ground_clear_scene()
+        work_collection = bpy.data.collections["Ground_Work"]
+        texture_patterns, name_patterns = GROUND_TEXTURE_PATTERNS, GROUND_NAME_PATTERNS
+    else:
+        bpy.ops.wtt.air_clear_scene()
+        work_collection = bpy.data.collections["Aviation_Work"]
+        texture_patterns, name_patterns = AIR_TEXTURE_PATTERNS, AIR_NAME_PATTERNS
+
+    rng = random.Random(seed)
+    template = create_template_mesh()
+    materials = create_texture_materials(texture_patterns, texture_count)
+
+    body_obj = None
+    for i in range(object_count):
+        name = name_patterns[i % len(name_patterns)].format(v="veh", i=i)
+        mat_index = rng.randrange(texture_count)
+
+        mesh = template.copy()
+        mesh.materials.append(materials[mat_index])
+        obj = bpy.data.objects.new(name, mesh)
+        obj.location = (rng.uniform(-10, 10), rng.uniform(-10, 10), rng.uniform(0, 5))
+        work_collection.objects.link(obj)
+        if body_obj is None and mat_index == 0:
+            body_obj = obj
+
+    bpy.data.meshes.remove(template)
+    return work_collection, body_obj
+
+def run_benchmark(wtt, vehicle, object_count, texture_count, seed):
+    context = bpy.context
+    scene = context.scene
+    scene.wtt_show_ground_panel = vehicle == "ground"
+    scene.wtt_show_air_panel_adv = vehicle == "air"
+    scene.wtt_hide_not_delete = False
+
+    clear_data()
+    start = time.perf_counter()
+    work_collection, body_obj = generate_scene(vehicle, object_count, texture_count, seed)
+    wtt.invalidate_texture_cache()
+    rows = [{
+        "vehicle": vehicle,
+        "objects": object_count,
+        "textures": texture_count,
+        "step": "generate",
+        "result": "FINISHED",
+        "seconds": round(time.perf_counter() - start, 4),
+        "objects_after": len(bpy.data.objects),
+    }]
+
+    layer_collection = context.view_layer.layer_collection.children.get(work_collection.name)
+    if layer_collection:
+        context.view_layer.active_layer_collection = layer_collection
+    if body_obj:
+        context.view_layer.objects.active = body_obj
+
+    for step_name, idname in (GROUND_STEPS if vehicle == "ground" else AIR_STEPS):
+        category, op_name = idname.split(".")
+        op = getattr(getattr(bpy.ops, category), op_name)
+
+        start = time.perf_counter()
+        try:
+            result = ",".join(sorted(op()))
+        except RuntimeError as e:
+            result = f"ERROR: {e}"
+        seconds = time.perf_counter() - start
+
+        rows.append({
+            "vehicle": vehicle,
+            "objects": object_count,
+            "textures": texture_count,
+            "step": step_name,
+            "result": result,
+            "seconds": round(seconds, 4),
+            "objects_after": len(bpy.data.objects),
+        })
+        print(f"[WTT] bench {vehicle} {object_count}: {step_name} {result} {seconds:.3f}s")
+    return rows
+
+def parse_args():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(prog="wtt_benchmark.py")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000], help="Object counts to benchmark")
+    parser.add_argument("--textures", type=int, default=64, help="Number of distinct textures per scene")
+    parser.add_argument("--vehicle", choices=["ground", "air", "both"], default="both")
+    parser.add_argument("--output", default=os.getcwd(), help="Folder for wtt_benchmark.json / .csv")
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args(argv)
+
+def main():
+    args = parse_args()
+    wtt = load_addon()
+    vehicles = ["ground", "air"] if args.vehicle == "both" else [args.vehicle]
+
+    rows = []
+    start = time.perf_counter()
+    for vehicle in vehicles:
+        for object_count in args.sizes:
+            rows.extend(run_benchmark(wtt, vehicle, object_count, args.textures, args.seed))
+
+    report = {
+        "addon_version": list(wtt.bl_info["version"]),
+        "blender_version": bpy.app.version_string,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "sizes": args.sizes,
+        "textures": args.textures,
+        "seed": args.seed,
+        "wall_seconds": round(time.perf_counter() - start, 4),
+        "rows": rows,
+    }
+
+    os.makedirs(args.output, exist_ok=True)
+    with open(os.path.join(args.output, "wtt_benchmark.json"), "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    with open(os.path.join(args.output, "wtt_benchmark.csv"), "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+    print(f"[WTT] Benchmark done in {report['wall_seconds']}s, report written to '{args.output}'.")
+
+if __name__ == "__main__":
+    main()